@@ -0,0 +1,277 @@
+import os
+import zlib
+import shutil
+import struct
+import hashlib
+import logging
+import tarfile
+import zipfile
+
+log = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+ZIP_LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")
+ZIP_LOCAL_SIGNATURE = b"PK\x03\x04"
+ZIP_DESCRIPTOR_SIGNATURE = b"PK\x07\x08"
+# Início do diretório central: não há mais membros depois dele
+ZIP_END_SIGNATURES = (b"PK\x01\x02", b"PK\x05\x06", b"PK\x06\x06")
+
+
+class ArchiveError(Exception):
+    pass
+
+
+class StreamingUnsupported(ArchiveError):
+    """O arquivo não pode ser extraído em fluxo e precisa ser baixado inteiro antes"""
+
+
+def archive_format(game):
+    """"tar", "zip" ou None (executável avulso), pelo campo "archive" ou pela extensão"""
+    if game.get("archive"):
+        return game["archive"]
+    name = game["file"].lower()
+    if name.endswith(".zip"):
+        return "zip"
+    if name.endswith(TAR_SUFFIXES):
+        return "tar"
+    return None
+
+
+class ChunkReader:
+    """Arquivo somente leitura sobre um iterador de blocos de bytes
+
+    Permite devolver bytes lidos a mais (`unread`), o que a leitura dos
+    cabeçalhos do zip precisa.
+    """
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.buffer = bytearray()
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            data = bytes(self.buffer) + b"".join(self.chunks)
+            self.buffer.clear()
+            return data
+        while len(self.buffer) < size:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                break
+            self.buffer += chunk
+        data = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        return data
+
+    def read_exact(self, size):
+        data = self.read(size)
+        if len(data) != size:
+            raise ArchiveError("Arquivo truncado")
+        return data
+
+    def unread(self, data):
+        self.buffer[:0] = data
+
+    def drain(self):
+        """Consome o restante do fluxo (ex.: diretório central do zip)"""
+        self.buffer.clear()
+        for _ in self.chunks:
+            pass
+
+
+def member_name(name):
+    """Normaliza o nome de um membro e recusa caminhos que saiam do diretório do jogo"""
+    name = name.replace("\\", "/")
+    parts = [part for part in name.split("/") if part not in ("", ".")]
+    if not parts or name.startswith("/") or ".." in parts or ":" in parts[0]:
+        return None
+    return "/".join(parts)
+
+
+def write_member(chunks, target, executable=False):
+    """Grava os blocos de um membro em `target` e devolve (tamanho, md5, crc32)"""
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    digest = hashlib.md5()
+    crc = 0
+    size = 0
+    with open(target, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+            digest.update(chunk)
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+    if executable:
+        os.chmod(target, 0o755)
+    return size, digest.hexdigest(), crc
+
+
+def extract_tar(reader, staging):
+    """Extrai um tar (comprimido ou não) lido em fluxo; devolve {membro: md5}"""
+    files = {}
+    with tarfile.open(fileobj=reader, mode="r|*") as archive:
+        for member in archive:
+            name = member_name(member.name)
+            if name is None:
+                raise ArchiveError(f"Caminho inválido no arquivo: {member.name}")
+            target = os.path.join(staging, name)
+            if member.isdir():
+                os.makedirs(target, exist_ok=True)
+            elif member.isfile():
+                source = archive.extractfile(member)
+                _, md5, _ = write_member(iter(lambda: source.read(CHUNK_SIZE), b""), target,
+                                         executable=bool(member.mode & 0o111))
+                files[name] = md5
+            else:
+                log.warning(f"Ignorando {member.name}: tipo de membro não suportado")
+    return files
+
+
+def _zip64_sizes(extra, compressed, uncompressed):
+    offset = 0
+    while offset + 4 <= len(extra):
+        header_id, length = struct.unpack_from("<HH", extra, offset)
+        if header_id == 0x0001:
+            values = list(struct.unpack_from(f"<{length // 8}Q", extra, offset + 4))
+            if uncompressed == 0xFFFFFFFF and values:
+                uncompressed = values.pop(0)
+            if compressed == 0xFFFFFFFF and values:
+                compressed = values.pop(0)
+            return compressed, uncompressed, True
+        offset += 4 + length
+    return compressed, uncompressed, False
+
+
+def _stored_chunks(reader, size):
+    remaining = size
+    while remaining > 0:
+        chunk = reader.read(min(CHUNK_SIZE, remaining))
+        if not chunk:
+            raise ArchiveError("Arquivo zip truncado")
+        remaining -= len(chunk)
+        yield chunk
+
+
+def _inflated_chunks(reader, compressed_size):
+    """Descomprime um membro deflate; sem tamanho conhecido, para no fim do fluxo deflate"""
+    decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+    remaining = compressed_size
+    while not decompressor.eof:
+        if remaining == 0:
+            raise ArchiveError("Membro deflate incompleto")
+        data = reader.read(CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining))
+        if not data:
+            raise ArchiveError("Arquivo zip truncado")
+        if remaining is not None:
+            remaining -= len(data)
+        output = decompressor.decompress(data)
+        if output:
+            yield output
+    if decompressor.unused_data:
+        reader.unread(decompressor.unused_data)
+
+
+def extract_zip(reader, staging):
+    """Extrai um zip lido em fluxo pelos cabeçalhos locais; devolve {membro: md5}
+
+    O CRC32 de cada membro é conferido. Membros sem compressão com tamanho só
+    no descritor de dados não têm fim detectável em fluxo e geram
+    StreamingUnsupported, assim como criptografia e métodos além de deflate.
+    """
+    files = {}
+    while True:
+        signature = reader.read(4)
+        if not signature or signature in ZIP_END_SIGNATURES:
+            break
+        if signature != ZIP_LOCAL_SIGNATURE:
+            raise ArchiveError("Arquivo zip inválido")
+        (_, _, flags, method, _, _, crc, compressed, uncompressed,
+         name_length, extra_length) = ZIP_LOCAL_HEADER.unpack(
+            signature + reader.read_exact(ZIP_LOCAL_HEADER.size - 4))
+        raw_name = reader.read_exact(name_length)
+        extra = reader.read_exact(extra_length)
+        compressed, uncompressed, zip64 = _zip64_sizes(extra, compressed, uncompressed)
+        has_descriptor = bool(flags & 0x08)
+
+        if flags & 0x01:
+            raise StreamingUnsupported("zip criptografado")
+        if method not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            raise StreamingUnsupported(f"método de compressão {method} não suportado em fluxo")
+        if has_descriptor and method == zipfile.ZIP_STORED:
+            raise StreamingUnsupported("membro sem compressão com descritor de dados")
+
+        original = raw_name.decode("utf-8" if flags & 0x800 else "cp437")
+        name = member_name(original)
+        if name is None:
+            raise ArchiveError(f"Caminho inválido no arquivo: {original}")
+
+        if method == zipfile.ZIP_STORED:
+            chunks = _stored_chunks(reader, compressed)
+        else:
+            chunks = _inflated_chunks(reader, None if has_descriptor else compressed)
+
+        target = os.path.join(staging, name)
+        if original.endswith("/"):
+            for _ in chunks:
+                pass
+            os.makedirs(target, exist_ok=True)
+            size, md5, actual_crc = 0, None, 0
+        else:
+            size, md5, actual_crc = write_member(chunks, target)
+
+        if has_descriptor:
+            data = reader.read_exact(4)
+            if data == ZIP_DESCRIPTOR_SIGNATURE:
+                data = reader.read_exact(4)
+            crc = struct.unpack("<I", data)[0]
+            sizes = reader.read_exact(16 if zip64 else 8)
+            uncompressed = struct.unpack("<QQ" if zip64 else "<II", sizes)[1]
+
+        if actual_crc != crc or size != uncompressed:
+            raise ArchiveError(f"CRC32 ou tamanho não confere em {original}")
+        if md5 is not None:
+            files[name] = md5
+    return files
+
+
+def extract_zip_file(path, staging):
+    """Extrai um zip já baixado (caminho para os casos sem suporte a fluxo)"""
+    files = {}
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            name = member_name(info.filename)
+            if name is None:
+                raise ArchiveError(f"Caminho inválido no arquivo: {info.filename}")
+            target = os.path.join(staging, name)
+            if info.is_dir():
+                os.makedirs(target, exist_ok=True)
+                continue
+            # ZipExtFile confere o CRC32 ao chegar ao fim do membro
+            with archive.open(info) as source:
+                _, md5, _ = write_member(iter(lambda: source.read(CHUNK_SIZE), b""), target,
+                                         executable=bool((info.external_attr >> 16) & 0o111))
+            files[name] = md5
+    return files
+
+
+def extract_stream(chunks, archive_type, staging):
+    reader = ChunkReader(chunks)
+    if archive_type == "tar":
+        files = extract_tar(reader, staging)
+    else:
+        files = extract_zip(reader, staging)
+    reader.drain()
+    return files
+
+
+def commit_staging(staging, final):
+    """Troca o diretório final pelo de preparação com renomeações no mesmo disco"""
+    old = None
+    if os.path.exists(final):
+        old = final + ".old"
+        shutil.rmtree(old, ignore_errors=True)
+        os.rename(final, old)
+    os.rename(staging, final)
+    if old:
+        shutil.rmtree(old, ignore_errors=True)
@@ -0,0 +1,133 @@
+"""Benchmark do tempo de importação e de abertura do launcher.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_startup.py --runs 5 --output startup.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ["requests", "pygame", "PIL"]
+
+IMPORT_SNIPPET = """
+import sys, time, json
+start = time.perf_counter()
+import main
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({"import_ms": elapsed,
+                  "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+STARTUP_SNIPPET = """
+import time
+start = time.perf_counter()
+import json
+import tkinter as tk
+import main
+import input_trace
+
+root = tk.Tk()
+# Sem portas abertas nem arquivos gravados na árvore do repositório
+app = main.GameLauncher(root, input_trace.isolated_config(startup_snapshot_path=%r))
+
+def wait_ready():
+    if "deferred_ready" in app.startup_marks:
+        marks = {name: (value - start) * 1000 for name, value in app.startup_marks.items()}
+        print(json.dumps(marks))
+        app.on_closing()
+    else:
+        root.after(10, wait_ready)
+
+root.after(10, wait_ready)
+root.mainloop()
+"""
+
+
+def run_snippet(snippet, timeout=60):
+    """Executa um trecho em um interpretador novo e devolve o JSON impresso"""
+    result = subprocess.run(
+        [sys.executable, "-c", snippet],
+        cwd=REPO_DIR,
+        capture_output=True,
+        text=True,
+        timeout=timeout
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "falhou")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def summarize(values):
+    return {
+        "median": round(statistics.median(values), 2),
+        "min": round(min(values), 2),
+        "max": round(max(values), 2)
+    }
+
+
+def bench_import(runs):
+    """Mede o custo de `import main` e quais módulos pesados ele carrega"""
+    samples = [run_snippet(IMPORT_SNIPPET) for _ in range(runs)]
+    return {
+        "import_ms": summarize([s["import_ms"] for s in samples]),
+        "heavy_modules_loaded": samples[-1]["loaded"]
+    }
+
+
+def bench_startup(runs):
+    """Mede primeira pintura, menu pronto e fim da inicialização adiada
+
+    O snapshot de inicialização vai para um diretório temporário compartilhado
+    pelas execuções: a primeira o grava e as seguintes o reaproveitam.
+    """
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        return {"skipped": "sem DISPLAY (use xvfb-run)"}
+
+    with tempfile.TemporaryDirectory(prefix="bench-startup-") as temp_dir:
+        snippet = STARTUP_SNIPPET % os.path.join(temp_dir, "startup.snapshot")
+        try:
+            samples = [run_snippet(snippet) for _ in range(runs)]
+        except Exception as e:
+            return {"error": str(e)}
+
+    return {
+        name: summarize([s[name] for s in samples])
+        for name in ("first_paint", "menu_ready", "deferred_ready")
+    }
+
+
+def run(runs=5):
+    return {
+        "benchmark": "startup",
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": sys.version.split()[0],
+        "runs": runs,
+        "import": bench_import(runs),
+        "startup": bench_startup(runs)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de abertura do launcher")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="arquivo JSON para salvar o resultado")
+    args = parser.parse_args()
+
+    results = run(args.runs)
+    text = json.dumps(results, indent=2, ensure_ascii=False)
+    print(text)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
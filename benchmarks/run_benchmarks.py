@@ -0,0 +1,386 @@
+"""Suíte de benchmarks do launcher; funciona offline.
+
+Mede throughput de download (contra o servidor local em standin_server),
+troca de espelho no meio do download, velocidade de hash, leitura com e sem
+pré-carregamento no cache do sistema, decodificação e miniatura de capas, montagem do menu de
+jogos com N jogos sintéticos, navegação na interface pygame, reprodução de um
+trace de entrada na interface Tk e tempo de abertura. Uso (a partir da raiz):
+    python benchmarks/run_benchmarks.py --output atual.json --compare anterior.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from standin_server import StandinServer, create_synthetic_file
+import bench_startup
+
+MB = 1024 * 1024
+
+# Parâmetros de entrada, que não são comparados entre execuções
+PARAMETERS = {"size_mb", "latency_ms", "bandwidth_limit_mbps", "images", "games", "runs", "stall_timeout_s",
+              "events", "skipped", "count"}
+
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def bench_download(size_mb, latency_ms, bandwidth_mbps, repeat):
+    """Baixa um arquivo sintético do servidor local com installer.download_file"""
+    import installer
+
+    size = int(size_mb * MB)
+    bandwidth = bandwidth_mbps * MB if bandwidth_mbps else None
+    with StandinServer({"release.bin": size}, latency=latency_ms / 1000, bandwidth=bandwidth) as server, \
+            tempfile.TemporaryDirectory() as temp_dir:
+        destination = os.path.join(temp_dir, "release.bin")
+        seconds = timed(lambda: installer.download_file(server.url("release.bin"), destination), repeat)
+
+    return {
+        "size_mb": size_mb,
+        "latency_ms": latency_ms,
+        "bandwidth_limit_mbps": bandwidth_mbps,
+        "download_s": round(seconds, 3),
+        "throughput_mbps": round(size_mb / seconds, 1)
+    }
+
+
+def bench_failover(size_mb, stall_timeout, repeat):
+    """Download com dois espelhos em que o mais rápido trava na metade da transferência"""
+    import installer
+
+    size = int(size_mb * MB)
+    with tempfile.TemporaryDirectory() as root, tempfile.TemporaryDirectory() as temp_dir:
+        files = {"release.bin": size}
+        with StandinServer(files, root=root, stall_after=size // 2) as stalling, \
+                StandinServer(files, root=root, latency=0.05) as healthy:
+            destination = os.path.join(temp_dir, "release.bin")
+            urls = [stalling.url("release.bin"), healthy.url("release.bin")]
+            seconds = timed(lambda: installer.download_file(urls, destination, stall_timeout=stall_timeout),
+                            repeat)
+
+    return {
+        "size_mb": size_mb,
+        "stall_timeout_s": stall_timeout,
+        "download_s": round(seconds, 3),
+        "overhead_s": round(seconds - stall_timeout, 3)
+    }
+
+
+def bench_hash(size_mb, repeat):
+    """Compara o hash via mmap do verify com a leitura em blocos de 4 KB usada antes"""
+    import hashlib
+    import verify
+
+    def hash_4k(path):
+        digest = hashlib.md5()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(4096), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = create_synthetic_file(os.path.join(temp_dir, "game.bin"), int(size_mb * MB))
+        mmap_s = timed(lambda: verify.hash_file(path), repeat)
+        read_4k_s = timed(lambda: hash_4k(path), repeat)
+
+    return {
+        "size_mb": size_mb,
+        "mmap_mbps": round(size_mb / mmap_s, 1),
+        "read_4k_mbps": round(size_mb / read_4k_s, 1)
+    }
+
+
+def bench_prefetch(size_mb, repeat):
+    """Lê um arquivo frio (fora do page cache) com e sem o pré-carregamento do prefetch
+
+    Usa POSIX_FADV_DONTNEED para tirar o arquivo do cache, o que não exige
+    root; em SSD/tmpfs a diferença é pequena, em HD e cartão SD é grande.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return {"skipped": "posix_fadvise indisponível"}
+
+    import prefetch
+
+    def evict(path):
+        with open(path, "rb") as f:
+            os.fsync(f.fileno())
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+    def read(path):
+        with open(path, "rb", buffering=0) as f:
+            while f.read(MB):
+                pass
+
+    def cold():
+        evict(path)
+        read(path)
+
+    def warmed():
+        evict(path)
+        buffer = bytearray(MB)
+        with open(path, "rb", buffering=0) as f:
+            for offset in range(0, size, prefetch.SLICE_SIZE):
+                prefetch.warm_slice(f, offset, min(prefetch.SLICE_SIZE, size - offset), buffer)
+        # Simula o tempo de permanência na seleção antes de apertar X
+        time.sleep(0.5)
+        start = time.perf_counter()
+        read(path)
+        return time.perf_counter() - start
+
+    size = int(size_mb * MB)
+    with tempfile.TemporaryDirectory(dir=REPO_DIR) as temp_dir:
+        path = create_synthetic_file(os.path.join(temp_dir, "game.exe"), size)
+        cold_s = timed(cold, repeat)
+        warm_s = statistics.median(warmed() for _ in range(repeat))
+
+    return {
+        "size_mb": size_mb,
+        "cold_read_ms": round(cold_s * 1000, 1),
+        "prefetched_read_ms": round(warm_s * 1000, 1)
+    }
+
+
+def bench_covers(repeat):
+    """Decodifica e redimensiona as capas e ícones do catálogo como os menus fazem"""
+    from PIL import Image
+    import catalog
+
+    paths = sorted({game["cover"] for game in catalog.GAMES} | set(catalog.ICONS))
+    paths = [path for path in paths if os.path.exists(os.path.join(REPO_DIR, path))]
+
+    def decode():
+        for path in paths:
+            with Image.open(os.path.join(REPO_DIR, path)) as image:
+                image.load()
+
+    def thumbnail():
+        for path in paths:
+            with Image.open(os.path.join(REPO_DIR, path)) as image:
+                image.convert("RGBA").resize((120, 120), Image.LANCZOS)
+
+    decode_s = timed(decode, repeat)
+    thumbnail_s = timed(thumbnail, repeat)
+    return {
+        "images": len(paths),
+        "decode_ms_per_image": round(decode_s / len(paths) * 1000, 2),
+        "thumbnail_ms_per_image": round(thumbnail_s / len(paths) * 1000, 2)
+    }
+
+
+def bench_menu(game_count, repeat):
+    """Monta o menu de jogos com `game_count` jogos sintéticos (precisa de display)"""
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        return {"skipped": "sem DISPLAY (use xvfb-run)"}
+
+    import tkinter as tk
+    import main
+    import catalog
+    import input_trace
+
+    os.chdir(REPO_DIR)
+    with tempfile.TemporaryDirectory(prefix="bench-menu-") as temp_dir:
+        # O snapshot gravado no encerramento fica fora da árvore do repositório
+        config = input_trace.isolated_config(
+            startup_snapshot_path=os.path.join(temp_dir, "startup.snapshot"))
+        root = tk.Tk()
+        app = None
+        try:
+            app = main.GameLauncher(root, config)
+            root.update()
+            app.games = input_trace.synthetic_games(game_count, catalog.GAMES[0])
+            # Metadados já em cache: a lista não consulta a rede durante a medição
+            input_trace.prime_metadata(app.metadata, app.games)
+
+            def build():
+                app.setup_games_menu()
+                root.update_idletasks()
+
+            first_s = timed(build, 1)
+            warm_s = timed(build, repeat)
+        finally:
+            if app is not None:
+                app.on_closing()
+            else:
+                root.destroy()
+
+    return {
+        "games": game_count,
+        "first_build_ms": round(first_s * 1000, 1),
+        "cached_build_ms": round(warm_s * 1000, 1)
+    }
+
+
+def bench_render(game_count, steps=300):
+    """Navega pela lista de jogos da interface pygame (driver de vídeo dummy)
+
+    Mede o tempo de CPU por quadro (entrada + redesenho parcial); para 60 fps
+    o quadro precisa caber em 16,7 ms.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import launcher_config
+    import catalog
+    import input_trace
+    import pygame_ui
+
+    os.chdir(REPO_DIR)
+    config = dict(launcher_config.DEFAULTS, metrics_port=0, metrics_json_path=None, prefetch_enabled=False)
+    app = pygame_ui.PygameLauncher(config, fullscreen=False)
+    try:
+        app.games = input_trace.synthetic_games(game_count, catalog.GAMES[0])
+        # Metadados já em cache: a lista não consulta a rede durante a medição
+        input_trace.prime_metadata(app.metadata, app.games)
+        app.step()
+        app.dispatch_input("keyboard", "confirm")
+        app.step()
+
+        frames = []
+        for i in range(steps):
+            start = time.perf_counter()
+            app.dispatch_input("keyboard", "down" if i < steps // 2 else "up")
+            app.step()
+            frames.append(time.perf_counter() - start)
+    finally:
+        app.shutdown()
+
+    frames.sort()
+    return {
+        "games": game_count,
+        "frame_ms_median": round(statistics.median(frames) * 1000, 2),
+        "frame_ms_p99": round(frames[int(len(frames) * 0.99) - 1] * 1000, 2)
+    }
+
+
+def bench_replay(game_count, trace=None):
+    """Reproduz um trace de entrada no launcher Tk (precisa de display, ex.: xvfb-run)
+
+    Sem trace gravado, desce e sobe por toda a lista de `game_count` jogos.
+    """
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        return {"skipped": "sem DISPLAY (use xvfb-run)"}
+
+    import input_trace
+
+    events = input_trace.load_trace(trace) if trace else input_trace.default_trace(game_count)
+    os.chdir(REPO_DIR)
+    summary = input_trace.summarize(input_trace.run_replay(events, game_count))
+    summary["games"] = game_count
+    return summary
+
+
+SUITES = ["download", "failover", "hash", "prefetch", "covers", "menu", "render", "replay", "startup"]
+
+
+def run(args):
+    results = {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "results": {}
+    }
+    suites = args.only or SUITES
+    for suite in suites:
+        start = time.perf_counter()
+        try:
+            if suite == "download":
+                result = bench_download(args.download_mb, args.latency_ms, args.bandwidth_mbps, args.repeat)
+            elif suite == "failover":
+                result = bench_failover(args.download_mb, args.stall_timeout, args.repeat)
+            elif suite == "hash":
+                result = bench_hash(args.hash_mb, args.repeat)
+            elif suite == "prefetch":
+                result = bench_prefetch(args.prefetch_mb, args.repeat)
+            elif suite == "covers":
+                result = bench_covers(args.repeat)
+            elif suite == "menu":
+                result = bench_menu(args.games, args.repeat)
+            elif suite == "render":
+                result = bench_render(args.games)
+            elif suite == "replay":
+                result = bench_replay(args.games, args.trace)
+            else:
+                result = bench_startup.run(args.repeat)
+        except Exception as e:
+            result = {"error": f"{type(e).__name__}: {e}"}
+        print(f"{suite}: concluído em {time.perf_counter() - start:.1f}s", file=sys.stderr)
+        results["results"][suite] = result
+    return results
+
+
+def flatten(data, prefix=""):
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(previous, current):
+    """Lista a variação percentual de cada métrica numérica entre duas execuções"""
+    before = flatten(previous["results"])
+    after = flatten(current["results"])
+    lines = []
+    for name in sorted(before.keys() & after.keys()):
+        old, new = before[name], after[name]
+        if old == new or not old or name.split(".")[-1] in PARAMETERS:
+            continue
+        change = (new - old) / old * 100
+        # Tempos (_ms, _s) são melhores quando menores; taxas (_mbps) quando maiores
+        lower_better = any(part.endswith(("_ms", "_s")) or "_ms_" in part for part in name.split("."))
+        better = change < 0 if lower_better else change > 0
+        lines.append(f"{'melhor' if better else 'pior':6} {name}: {old} -> {new} ({change:+.1f}%)")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks do launcher")
+    parser.add_argument("--only", nargs="+", choices=SUITES, help="executa só estas suítes")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--download-mb", type=float, default=64)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--bandwidth-mbps", type=float, help="limite de banda do servidor local em MB/s")
+    parser.add_argument("--stall-timeout", type=float, default=1.0,
+                        help="segundos sem dados antes de trocar de espelho (suíte failover)")
+    parser.add_argument("--hash-mb", type=float, default=256)
+    parser.add_argument("--prefetch-mb", type=float, default=128)
+    parser.add_argument("--games", type=int, default=200, help="jogos sintéticos no benchmark do menu")
+    parser.add_argument("--trace", help="trace de entrada gravado com main.py --record-trace (suíte replay)")
+    parser.add_argument("--output", help="salva o resultado em JSON")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para comparar")
+    args = parser.parse_args()
+
+    results = run(args)
+    text = json.dumps(results, indent=2, ensure_ascii=False)
+    print(text)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+        for line in compare(previous, results) or ["sem diferenças"]:
+            print(line, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
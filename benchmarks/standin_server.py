@@ -0,0 +1,137 @@
+"""Servidor HTTP local que imita o host de releases, para benchmarks e testes offline.
+
+Serve arquivos sintéticos com suporte a Range e permite injetar latência por
+requisição e limite de banda. Uso avulso (a partir da raiz do repositório):
+    python benchmarks/standin_server.py --file target_game.exe=200 --latency-ms 50 --bandwidth-mbps 20
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from range_server import RangeRequestHandler, BackgroundServer
+
+BLOCK = 1024 * 1024
+
+
+def create_synthetic_file(path, size):
+    """Cria um arquivo de `size` bytes com conteúdo pseudoaleatório"""
+    block = os.urandom(BLOCK)
+    with open(path, "wb") as f:
+        written = 0
+        index = 0
+        while written < size:
+            # O índice no início evita blocos idênticos
+            data = index.to_bytes(8, "little") + block[8:]
+            data = data[:size - written]
+            f.write(data)
+            written += len(data)
+            index += 1
+    return path
+
+
+def make_handler(root, latency=0.0, bandwidth=None, stall_after=None):
+    """Cria o handler que serve `root` com latência (s), banda (bytes/s) e travamento opcional
+
+    `stall_after` faz cada resposta parar de enviar dados depois desse número
+    de bytes, simulando um servidor que trava no meio da transferência.
+    """
+
+    class StandinHandler(RangeRequestHandler):
+        def resolve_path(self, url_path):
+            name = os.path.basename(url_path)
+            return os.path.join(root, name) if name else None
+
+        def serve(self, send_body):
+            if latency:
+                time.sleep(latency)
+            self.sent = 0
+            super().serve(send_body)
+
+        def write_chunk(self, chunk):
+            if stall_after is not None and self.sent + len(chunk) > stall_after:
+                chunk = chunk[:max(0, stall_after - self.sent)]
+                self.wfile.write(chunk)
+                self.wfile.flush()
+                self.sent += len(chunk)
+                time.sleep(3600)
+            if bandwidth:
+                # Envia em fatias pequenas para manter a taxa estável
+                step = max(1024, int(bandwidth / 50))
+                for offset in range(0, len(chunk), step):
+                    piece = chunk[offset:offset + step]
+                    self.wfile.write(piece)
+                    time.sleep(len(piece) / bandwidth)
+            else:
+                self.wfile.write(chunk)
+            self.sent += len(chunk)
+
+    return StandinHandler
+
+
+class StandinServer(BackgroundServer):
+    """Servidor local com arquivos sintéticos; use como context manager"""
+
+    def __init__(self, files, latency=0.0, bandwidth=None, stall_after=None, root=None, port=0):
+        self.temp_dir = None
+        if root is None:
+            self.temp_dir = tempfile.TemporaryDirectory(prefix="standin-")
+            root = self.temp_dir.name
+        self.root = root
+        for name, size in files.items():
+            path = os.path.join(root, name)
+            if not os.path.exists(path) or os.path.getsize(path) != size:
+                create_synthetic_file(path, size)
+        super().__init__(make_handler(root, latency, bandwidth, stall_after), port=port)
+
+    def url(self, name):
+        return f"{self.base_url}/{name}"
+
+    def path(self, name):
+        return os.path.join(self.root, name)
+
+    def stop(self):
+        super().stop()
+        if self.temp_dir is not None:
+            self.temp_dir.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local que imita o host de releases")
+    parser.add_argument("--file", action="append", default=[],
+                        help="nome=tamanho_em_MB (pode repetir; padrão: target_game.exe=100)")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--bandwidth-mbps", type=float, help="limite de banda em MB/s")
+    parser.add_argument("--stall-after-mb", type=float, help="trava cada resposta após N MB")
+    parser.add_argument("--root", help="diretório dos arquivos (padrão: temporário)")
+    args = parser.parse_args()
+
+    files = {}
+    for spec in args.file or ["target_game.exe=100"]:
+        name, size_mb = spec.split("=")
+        files[name] = int(float(size_mb) * 1024 * 1024)
+
+    server = StandinServer(
+        files,
+        latency=args.latency_ms / 1000,
+        bandwidth=args.bandwidth_mbps * 1024 * 1024 if args.bandwidth_mbps else None,
+        stall_after=int(args.stall_after_mb * 1024 * 1024) if args.stall_after_mb else None,
+        root=args.root,
+        port=args.port
+    )
+    with server:
+        for name in files:
+            print(server.url(name))
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
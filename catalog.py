@@ -0,0 +1,137 @@
+import os
+import copy
+import json
+import logging
+
+import archives
+
+log = logging.getLogger(__name__)
+
+INSTALL_DIR = "TargetGame"
+RELEASE_HOST = "github.com"
+# MD5 fixados pela STAFF para jogos sem "md5" no catálogo: {id: {versão: md5}}.
+# Gerado com `toolstaff hashes --write` em uma máquina com os jogos verificados.
+HASHES_PATH = "catalog_hashes.json"
+
+GAMES = [
+    {
+        "id": "target_game",
+        "title": "Target Game",
+        "version": "v2.0",
+        "size": "45 MB",
+        "file": "target_game.exe",
+        "repo": "gu2121gg/Projeto-Xemuloter",
+        "cover": os.path.join("assets", "games", "game1.jpg")
+    },
+    {
+        "id": "ps2_emulator",
+        "title": "PS2 Emulator",
+        "version": "v1.5",
+        "size": "15 MB",
+        "file": "ps2_emulator.exe",
+        "repo": "gu2121gg/Projeto-Xemuloter",
+        "cover": os.path.join("assets", "icons", "opl_logo.png")
+    }
+]
+
+SOUNDS = {
+    "back": os.path.join("assets", "audio", "back.wav"),
+    "confirm": os.path.join("assets", "audio", "confirm.wav"),
+    "navigate": os.path.join("assets", "audio", "navigate.wav"),
+    "select": os.path.join("assets", "audio", "select.wav"),
+    "startup": os.path.join("assets", "audio", "startup.wav")
+}
+
+ICONS = [
+    os.path.join("assets", "icons", "game_icon.png"),
+    os.path.join("assets", "icons", "opl_logo.png")
+]
+
+
+def install_dir(game):
+    """Diretório onde são extraídos os jogos distribuídos em tar/zip"""
+    return os.path.join(INSTALL_DIR, game["id"])
+
+
+def install_path(game):
+    """Caminho do executável instalado de um jogo"""
+    if archives.archive_format(game):
+        # Jogo compactado: "executable" é relativo ao diretório extraído
+        if not game.get("executable"):
+            raise ValueError(f"{game['id']}: jogo compactado sem \"executable\" no catálogo")
+        return os.path.join(install_dir(game), game["executable"])
+    return os.path.join(INSTALL_DIR, game["file"])
+
+
+def invalid_reason(game):
+    """Motivo para uma entrada do catálogo não poder ser usada, ou None"""
+    if archives.archive_format(game) and not game.get("executable"):
+        return "jogo compactado sem \"executable\" (caminho do executável dentro do arquivo)"
+    return None
+
+
+def download_url(game):
+    """URL de download do jogo (explícita ou montada a partir do release no GitHub)"""
+    if game.get("download_url"):
+        return game["download_url"]
+    return f"https://{RELEASE_HOST}/{game['repo']}/releases/download/{game['version']}/{game['file']}"
+
+
+def download_urls(game):
+    """URLs do jogo: a principal seguida dos espelhos (campo "mirrors") do catálogo"""
+    urls = [download_url(game)]
+    urls.extend(url for url in game.get("mirrors", []) if url not in urls)
+    return urls
+
+
+def load_hashes(path=None):
+    try:
+        with open(path or HASHES_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        log.error(f"Erro ao ler hashes do catálogo {path or HASHES_PATH}: {e}")
+        return {}
+
+
+def save_hashes(hashes, path=None):
+    path = path or HASHES_PATH
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(hashes, f, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+def known_md5(game, hashes=None):
+    """MD5 confiável do arquivo do jogo: o do catálogo ou o fixado em HASHES_PATH"""
+    if game.get("md5"):
+        return game["md5"]
+    if hashes is None:
+        hashes = load_hashes()
+    return hashes.get(game["id"], {}).get(game["version"])
+
+
+def load_catalog():
+    """Devolve uma cópia do catálogo com o estado de instalação e os hashes fixados"""
+    games = []
+    for game in copy.deepcopy(GAMES):
+        reason = invalid_reason(game)
+        if reason:
+            log.error(f"Entrada {game['id']} ignorada no catálogo: {reason}")
+            continue
+        games.append(game)
+    hashes = load_hashes()
+    for game in games:
+        game["installed"] = os.path.exists(install_path(game))
+        md5 = known_md5(game, hashes)
+        if md5:
+            game["md5"] = md5
+    return games
+
+
+def find_game(games, game_id):
+    for game in games:
+        if game["id"] == game_id:
+            return game
+    return None
@@ -0,0 +1,197 @@
+import os
+import json
+import queue
+import socket
+import shutil
+import threading
+import time
+
+import catalog
+import install_records
+from verify import hash_file, expected_md5, file_signature, signature_matches
+from launcher_config import load_config
+
+OK = "ok"
+WARNING = "warning"
+FAIL = "fail"
+TIMEOUT = "timeout"
+
+# Ordem de gravidade para calcular o status geral
+SEVERITY = [OK, WARNING, TIMEOUT, FAIL]
+
+LABELS = {OK: "OK", WARNING: "AVISO", FAIL: "FALHA", TIMEOUT: "TEMPO ESGOTADO"}
+
+# Evita que a mensagem de boas-vindas do pygame polua a saída JSON
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+# A inicialização dos subsistemas do SDL não é segura entre threads
+_pygame_lock = threading.Lock()
+
+
+def check_install(game):
+    """Verifica se o jogo está instalado e, se houver hash conhecido, se ele confere
+
+    Em jogos compactados o md5 do catálogo é o do arquivo baixado; o
+    executável extraído é comparado com o hash do membro (catálogo ou registro
+    da instalação). O hash só é recalculado se tamanho, mtime ou inode
+    mudaram desde a última verificação registrada.
+    """
+    path = catalog.install_path(game)
+    if not os.path.exists(path):
+        return WARNING, "não instalado", {"path": path}
+
+    signature = file_signature(path)
+    details = {"path": path, "size": signature["size"]}
+    record = install_records.load_records().get(game["id"])
+    relpath = os.path.relpath(path, catalog.INSTALL_DIR)
+    expected = expected_md5(game, record, relpath)
+    if not expected:
+        return OK, "instalado (sem hash conhecido)", details
+
+    entry = (record or {}).get("files", {}).get(relpath, {})
+    if entry.get("md5") == expected and signature_matches(entry, signature):
+        details.update(md5=expected, verified_at=entry["verified_at"])
+        return OK, "instalado e íntegro (sem alterações desde a última verificação)", details
+
+    details["md5"] = hash_file(path)
+    if details["md5"] != expected:
+        return FAIL, "hash não confere com o catálogo", details
+    return OK, "instalado e íntegro", details
+
+
+def check_assets(games):
+    """Verifica áudios, ícones e capas usados pelo launcher"""
+    required = list(catalog.SOUNDS.values()) + catalog.ICONS + [game["cover"] for game in games]
+    missing = [path for path in required if not os.path.isfile(path)]
+    details = {"checked": len(required), "missing": missing}
+    if missing:
+        return WARNING, f"{len(missing)} de {len(required)} arquivos ausentes", details
+    return OK, f"{len(required)} arquivos presentes", details
+
+
+def check_disk(min_free_mb):
+    path = catalog.INSTALL_DIR if os.path.isdir(catalog.INSTALL_DIR) else "."
+    usage = shutil.disk_usage(path)
+    free_mb = usage.free / (1024 * 1024)
+    details = {"path": os.path.abspath(path), "free_mb": round(free_mb, 1),
+               "total_mb": round(usage.total / (1024 * 1024), 1)}
+    if free_mb < min_free_mb:
+        return FAIL, f"pouco espaço livre: {free_mb:.0f} MB (mínimo {min_free_mb} MB)", details
+    return OK, f"{free_mb:.0f} MB livres", details
+
+
+def check_audio():
+    import pygame
+    with _pygame_lock:
+        pygame.mixer.init()
+        try:
+            frequency, size, channels = pygame.mixer.get_init()
+        finally:
+            pygame.mixer.quit()
+    return OK, "mixer disponível", {"frequency": frequency, "channels": channels}
+
+
+def check_joystick():
+    import pygame
+    with _pygame_lock:
+        pygame.joystick.init()
+        try:
+            names = [pygame.joystick.Joystick(i).get_name() for i in range(pygame.joystick.get_count())]
+        finally:
+            pygame.joystick.quit()
+    if not names:
+        return WARNING, "nenhum controle conectado", {"joysticks": []}
+    return OK, f"{len(names)} controle(s) conectado(s)", {"joysticks": names}
+
+
+def check_release_host(timeout):
+    start = time.monotonic()
+    with socket.create_connection((catalog.RELEASE_HOST, 443), timeout=timeout):
+        pass
+    latency = (time.monotonic() - start) * 1000
+    return OK, f"{catalog.RELEASE_HOST} acessível ({latency:.0f} ms)", {"latency_ms": round(latency, 1)}
+
+
+def build_checks(config, budget):
+    games = catalog.load_catalog()
+    checks = [(f"install:{game['id']}", lambda g=game: check_install(g)) for game in games]
+    checks += [
+        ("assets", lambda: check_assets(games)),
+        ("disk", lambda: check_disk(config["status_min_free_mb"])),
+        ("audio", check_audio),
+        ("joystick", check_joystick),
+        ("release_host", lambda: check_release_host(budget)),
+    ]
+    return checks
+
+
+def _run_check(name, func, results):
+    start = time.monotonic()
+    try:
+        status, message, details = func()
+    except Exception as e:
+        status, message, details = FAIL, str(e) or type(e).__name__, {}
+    results.put({
+        "name": name,
+        "status": status,
+        "message": message,
+        "details": details,
+        "duration_ms": round((time.monotonic() - start) * 1000, 1)
+    })
+
+
+def run_checks(budget=None, config=None):
+    """Executa todas as verificações em paralelo e devolve o relatório dentro do prazo
+
+    Verificações que não terminam até `budget` segundos são reportadas como
+    tempo esgotado; as threads são daemon e não atrasam a saída do processo.
+    """
+    config = config or load_config()
+    budget = budget if budget is not None else config["status_budget"]
+    start = time.monotonic()
+    deadline = start + budget
+
+    checks = build_checks(config, budget)
+    results = queue.Queue()
+    for name, func in checks:
+        threading.Thread(target=_run_check, args=(name, func, results), daemon=True).start()
+
+    finished = {}
+    while len(finished) < len(checks):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            result = results.get(timeout=remaining)
+        except queue.Empty:
+            break
+        finished[result["name"]] = result
+
+    report = []
+    for name, _ in checks:
+        report.append(finished.get(name) or {
+            "name": name,
+            "status": TIMEOUT,
+            "message": f"não terminou em {budget:.1f}s",
+            "details": {},
+            "duration_ms": None
+        })
+
+    return {
+        "status": max((r["status"] for r in report), key=SEVERITY.index),
+        "hostname": socket.gethostname(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "duration_ms": round((time.monotonic() - start) * 1000, 1),
+        "checks": report
+    }
+
+
+def format_report(report):
+    lines = [f"Status geral: {LABELS[report['status']]} ({report['duration_ms']:.0f} ms)"]
+    for result in report["checks"]:
+        lines.append(f"  [{LABELS[result['status']]}] {result['name']}: {result['message']}")
+    return "\n".join(lines)
+
+
+def format_json(report):
+    return json.dumps(report, ensure_ascii=False)
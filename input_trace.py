@@ -0,0 +1,234 @@
+"""Gravação e reprodução dos eventos de entrada do launcher.
+
+Com `python main.py --record-trace entrada.jsonl` cada evento do controle ou
+do teclado que chega a `dispatch_input` é gravado como uma linha JSON. A
+reprodução roda o GameLauncher (Tk) com um catálogo sintético, sem controle
+conectado, entrega cada evento pelo mesmo caminho da entrada real (fila do
+agendador para o controle, tratador de teclas para o teclado) e mede quanto
+ele levou para ser tratado:
+    xvfb-run python input_trace.py entrada.jsonl --games 500 --output replay.json
+Sem arquivo de trace é usada uma navegação padrão pela lista de jogos.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import statistics
+from types import SimpleNamespace
+
+ACTIONS = ("up", "down", "confirm", "back")
+
+
+class TraceRecorder:
+    """Grava eventos de entrada em JSON Lines, com o tempo desde o início da gravação"""
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, "w", encoding="utf-8")
+        self.start = time.monotonic()
+        self.lock = threading.Lock()
+
+    def record(self, source, action, screen=None):
+        event = {"t": round(time.monotonic() - self.start, 4), "source": source,
+                 "action": action, "screen": screen}
+        with self.lock:
+            if not self.file.closed:
+                self.file.write(json.dumps(event) + "\n")
+                self.file.flush()
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+
+def load_trace(path):
+    events = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                event = json.loads(line)
+                if event.get("action") in ACTIONS:
+                    events.append(event)
+    return events
+
+
+def default_trace(game_count, interval=0.1, source="joystick"):
+    """Abre a lista de jogos, desce até o fim, volta ao topo e sai para o menu
+
+    O padrão é o controle, cujos eventos passam pela fila do agendador.
+    """
+    actions = ["confirm"] + ["down"] * (game_count - 1) + ["up"] * (game_count - 1) + ["back"]
+    return [{"t": round(i * interval, 4), "source": source, "action": action}
+            for i, action in enumerate(actions)]
+
+
+def synthetic_games(count, template):
+    return [dict(template, id=f"synthetic_{i}", title=f"Jogo Sintético {i}", installed=i % 2 == 0)
+            for i in range(count)]
+
+
+def prime_metadata(cache, games):
+    """Preenche o cache de metadados para o replay não consultar a rede"""
+    now = time.time()
+    with cache.lock:
+        for game in games:
+            cache.entries[game["id"]] = {"available": True, "size": None, "url": None, "error": None,
+                                         "latest_version": None, "checked_at": now}
+
+
+def isolated_config(**overrides):
+    """Configuração para medições: sem portas abertas, pré-carregamento, trace nem relatórios em disco"""
+    from launcher_config import load_config
+
+    config = dict(load_config(), input_trace_path=None, metrics_port=None, metrics_json_path=None,
+                  peer_cache_serve=False, prefetch_enabled=False, memory_report_path=None)
+    config.update(overrides)
+    return config
+
+
+def settle(root, scheduler, timeout=5.0):
+    """Processa eventos do Tk até o agendador da interface esvaziar"""
+    deadline = time.perf_counter() + timeout
+    root.update()
+    while scheduler.pending() and time.perf_counter() < deadline:
+        root.update()
+
+
+def replay(app, events, realtime=False, timeout=5.0):
+    """Reproduz `events` no GameLauncher e mede cada um
+
+    Eventos do controle passam por `post_input` (fila INPUT do agendador) e os
+    do teclado por `handle_keypress`. `queue_ms` é a espera até o tratador
+    começar, `handle_ms` o tempo dentro dele e `settle_ms`, contado desde a
+    entrega, inclui o redesenho e o trabalho agendado pelo evento (ex.: montar
+    os cards). Confirmar em um card de jogo abriria o jogo ou um download e por
+    isso é ignorado.
+    """
+    import main
+
+    keysyms = {}
+    for keysym, action in main.KEY_ACTIONS.items():
+        keysyms.setdefault(action, keysym)
+    dispatched = []
+    dispatch = app.dispatch_input
+
+    def timed_dispatch(source, action):
+        began = time.perf_counter()
+        dispatch(source, action)
+        dispatched.append((began, time.perf_counter()))
+
+    app.dispatch_input = timed_dispatch
+    timings = []
+    skipped = 0
+    start = time.perf_counter()
+    for event in events:
+        if realtime:
+            target = start + event["t"]
+            while time.perf_counter() < target:
+                app.root.update()
+                time.sleep(0.001)
+        if event["action"] == "confirm" and app.current_screen == "games":
+            skipped += 1
+            continue
+        screen = app.current_screen
+        dispatched.clear()
+        begin = time.perf_counter()
+        if event.get("source") == "joystick":
+            app.post_input(event["action"])
+        else:
+            app.handle_keypress(SimpleNamespace(keysym=keysyms[event["action"]]))
+        deadline = begin + timeout
+        while not dispatched:
+            if time.perf_counter() > deadline:
+                raise RuntimeError(f"Evento {event['action']} não foi tratado em {timeout}s")
+            app.root.update()
+        began, handled = dispatched[0]
+        settle(app.root, app.scheduler)
+        timings.append({"action": event["action"], "screen": screen, "source": event.get("source"),
+                        "queue_ms": (began - begin) * 1000,
+                        "handle_ms": (handled - began) * 1000,
+                        "settle_ms": (time.perf_counter() - begin) * 1000})
+    return {"events": timings, "skipped": skipped, "total_s": time.perf_counter() - start}
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def summarize(result):
+    """Mediana, p95 e máximo por ação e tela, mais o tempo total"""
+    groups = {}
+    for timing in result["events"]:
+        groups.setdefault(f"{timing['screen']}.{timing['action']}", []).append(timing)
+    summary = {"events": len(result["events"]), "skipped": result["skipped"],
+               "total_s": round(result["total_s"], 3), "actions": {}}
+    for name, timings in sorted(groups.items()):
+        entry = {"count": len(timings)}
+        for field in ("queue_ms", "handle_ms", "settle_ms"):
+            values = [timing[field] for timing in timings]
+            entry[f"{field[:-3]}_ms_median"] = round(statistics.median(values), 2)
+            entry[f"{field[:-3]}_ms_p95"] = round(percentile(values, 0.95), 2)
+            entry[f"{field[:-3]}_ms_max"] = round(max(values), 2)
+        summary["actions"][name] = entry
+    return summary
+
+
+def run_replay(events, game_count, realtime=False):
+    """Abre o launcher Tk com `game_count` jogos sintéticos e reproduz os eventos"""
+    import tkinter as tk
+    import main
+    import catalog
+
+    config = isolated_config(stall_watchdog_enabled=False, audio_enabled=False)
+    root = tk.Tk()
+    app = None
+    try:
+        app = main.GameLauncher(root, config)
+        while "deferred_ready" not in app.startup_marks:
+            root.update()
+        app.games = synthetic_games(game_count, catalog.GAMES[0])
+        prime_metadata(app.metadata, app.games)
+        return replay(app, events, realtime)
+    finally:
+        if app is not None:
+            app.running = False
+            app.metadata.shutdown()
+            app.supervisor.shutdown()
+            if hasattr(app, "stall_watchdog"):
+                app.stall_watchdog.stop()
+        root.destroy()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reproduz um trace de entrada no launcher e mede cada evento")
+    parser.add_argument("trace", nargs="?", help="arquivo gravado com --record-trace (padrão: navegação sintética)")
+    parser.add_argument("--games", type=int, default=200, help="jogos no catálogo sintético (padrão: 200)")
+    parser.add_argument("--realtime", action="store_true", help="respeita os intervalos gravados entre os eventos")
+    parser.add_argument("--output", help="salva o resultado em JSON")
+    parser.add_argument("--events", action="store_true", help="inclui o tempo de cada evento na saída")
+    args = parser.parse_args(argv)
+
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        print("Sem DISPLAY: rode com xvfb-run", file=sys.stderr)
+        return 2
+    events = load_trace(args.trace) if args.trace else default_trace(args.games)
+    result = run_replay(events, args.games, args.realtime)
+    summary = summarize(result)
+    summary["games"] = args.games
+    if args.events:
+        summary["timings"] = result["events"]
+    text = json.dumps(summary, indent=2, ensure_ascii=False)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+import os
+import json
+import threading
+from contextlib import contextmanager
+
+import catalog
+
+RECORDS_PATH = os.path.join(catalog.INSTALL_DIR, "installed.json")
+
+_lock = threading.Lock()
+
+
+def load_records(path=RECORDS_PATH):
+    """Lê o registro de instalações: {id do jogo: dados da instalação}"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError:
+        # Registro corrompido é tratado como vazio; será regravado na próxima instalação
+        return {}
+
+
+def save_records(records, path=RECORDS_PATH):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(records, f, indent=2, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+
+@contextmanager
+def editing_records(path=RECORDS_PATH):
+    """Carrega o registro, permite alterá-lo e grava ao sair do bloco"""
+    with _lock:
+        records = load_records(path)
+        yield records
+        save_records(records, path)
+
+
+def update_record(game_id, path=RECORDS_PATH, **fields):
+    """Atualiza (ou cria) o registro de um jogo de forma atômica"""
+    with editing_records(path) as records:
+        record = records.setdefault(game_id, {})
+        record.update(fields)
+        return dict(record)
+
+
+def remove_record(game_id, path=RECORDS_PATH):
+    with _lock:
+        records = load_records(path)
+        if records.pop(game_id, None) is not None:
+            save_records(records, path)
@@ -0,0 +1,360 @@
+import os
+import time
+import shutil
+import hashlib
+import logging
+import threading
+
+import archives
+import catalog
+import install_records
+import metrics
+import mirrors
+import peer_cache
+import storage
+from launcher_config import load_config
+
+log = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+HEADERS = {
+    'Accept': 'application/octet-stream',
+    'User-Agent': 'GameLauncher'
+}
+
+
+_buffers_lock = threading.Lock()
+_active_downloads = 0
+
+
+class DownloadCancelled(Exception):
+    pass
+
+
+class InstallError(Exception):
+    pass
+
+
+class ChecksumError(InstallError):
+    pass
+
+
+def response_total_size(response):
+    """Tamanho total do arquivo, pelo Content-Range (206) ou Content-Length (200)"""
+    content_range = response.headers.get('content-range', '')
+    if response.status_code == 206 and '/' in content_range:
+        total = content_range.rsplit('/', 1)[1]
+        return int(total) if total.isdigit() else 0
+    return int(response.headers.get('content-length', 0))
+
+
+def buffer_usage():
+    """Memória dos buffers de download em andamento: (bytes, downloads)
+
+    Cada transferência mantém um bloco de CHUNK_SIZE do requests e outro
+    sendo repassado para o disco ou para a extração.
+    """
+    with _buffers_lock:
+        return _active_downloads * 2 * CHUNK_SIZE, _active_downloads
+
+
+def iter_download(urls, progress_callback=None, is_cancelled=None, timeout=30,
+                  stall_timeout=None, probe_timeout=3, on_size=None):
+    """Gera os blocos de bytes de um arquivo, na ordem, trocando de espelho se preciso
+
+    `urls` é uma URL ou uma lista de espelhos do mesmo arquivo. Com vários
+    espelhos, eles são medidos em paralelo e usados do mais rápido para o
+    mais lento. Se a transferência falha ou fica `stall_timeout` segundos sem
+    receber dados, ela continua no próximo espelho a partir do byte em que
+    parou (Range). Um espelho que falha sem transferir nada é descartado.
+
+    `on_size` é chamada com o tamanho total (0 se desconhecido) assim que a
+    primeira resposta chega, antes de qualquer byte ser repassado; ela pode
+    abortar o download levantando uma exceção.
+    """
+    if isinstance(urls, str):
+        urls = [urls]
+    queue = mirrors.rank_mirrors(urls, probe_timeout, HEADERS) if len(urls) > 1 else list(urls)
+
+    global _active_downloads
+    with _buffers_lock:
+        _active_downloads += 1
+    try:
+        yield from _iter_mirrors(queue, progress_callback, is_cancelled, timeout, stall_timeout, on_size)
+    finally:
+        with _buffers_lock:
+            _active_downloads -= 1
+
+
+def _iter_mirrors(queue, progress_callback, is_cancelled, timeout, stall_timeout, on_size):
+    import requests
+
+    downloaded = 0
+    total_size = 0
+    start_time = time.time()
+
+    while True:
+        url = queue.pop(0)
+        attempt_start = downloaded
+        headers = dict(HEADERS)
+        if downloaded:
+            headers['Range'] = f'bytes={downloaded}-'
+        try:
+            with requests.get(url, headers=headers, stream=True,
+                              timeout=(timeout, stall_timeout or timeout)) as response:
+                response.raise_for_status()
+                skip = 0
+                if downloaded and response.status_code != 206:
+                    # Espelho sem suporte a Range: descarta o que já foi recebido
+                    log.warning(f"{url} não aceita Range; descartando os primeiros {downloaded} bytes")
+                    skip = downloaded
+                size = response_total_size(response)
+                if total_size and size and size != total_size:
+                    raise InstallError(f"Tamanho diferente entre espelhos: {size} != {total_size}")
+                if on_size and not total_size and not downloaded:
+                    on_size(size)
+                total_size = size or total_size
+
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    if is_cancelled and is_cancelled():
+                        raise DownloadCancelled("Download cancelado")
+                    if skip:
+                        if len(chunk) <= skip:
+                            skip -= len(chunk)
+                            continue
+                        chunk, skip = chunk[skip:], 0
+                    if not chunk:
+                        continue
+
+                    downloaded += len(chunk)
+                    metrics.DOWNLOAD_BYTES.inc(len(chunk))
+                    yield chunk
+
+                    if progress_callback:
+                        progress = (downloaded / total_size) * 100 if total_size > 0 else 0
+                        elapsed = time.time() - start_time
+                        speed = (downloaded / (1024 * 1024)) / elapsed if elapsed > 0 else 0
+                        progress_callback(progress, downloaded, total_size, speed)
+            break
+        except requests.RequestException as e:
+            if downloaded > attempt_start:
+                # Houve progresso: o espelho volta para o fim da fila
+                queue.append(url)
+            if not queue:
+                raise
+            metrics.MIRROR_FAILOVERS.inc()
+            log.warning(f"Falha em {url} após {downloaded} bytes ({e}); continuando em {queue[0]}")
+
+    if total_size > 0 and downloaded != total_size:
+        raise InstallError("Download incompleto - tamanho do arquivo não corresponde")
+
+
+def hashing(chunks, digest):
+    """Repassa os blocos atualizando `digest` com cada um"""
+    for chunk in chunks:
+        digest.update(chunk)
+        yield chunk
+
+
+def download_file(urls, destination, progress_callback=None, is_cancelled=None, timeout=30,
+                  stall_timeout=None, probe_timeout=3, on_size=None, expected_md5=None):
+    """Baixa o arquivo em `destination` e devolve (tamanho, md5)
+
+    Aceita os mesmos espelhos e opções de `iter_download`. O MD5 é calculado
+    enquanto os bytes chegam, sem reler o arquivo. O download é gravado em
+    `destination + ".part"` e só é renomeado ao final, depois de conferir
+    `expected_md5`; se não conferir, o arquivo anterior fica intacto.
+    """
+    part_path = destination + ".part"
+    hash_md5 = hashlib.md5()
+    size = 0
+
+    try:
+        with open(part_path, 'wb') as file:
+            for chunk in hashing(iter_download(urls, progress_callback, is_cancelled, timeout,
+                                               stall_timeout, probe_timeout, on_size), hash_md5):
+                file.write(chunk)
+                size += len(chunk)
+        md5 = hash_md5.hexdigest()
+        if expected_md5 and md5 != expected_md5:
+            raise ChecksumError(f"MD5 não confere: esperado {expected_md5}, obtido {md5}")
+        os.replace(part_path, destination)
+    except BaseException:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+
+    return size, md5
+
+
+def install_archive(game, urls, progress_callback=None, is_cancelled=None, **options):
+    """Baixa e extrai um jogo distribuído em tar/zip; devolve (tamanho, md5, {membro: md5})
+
+    Os membros são gravados direto no diretório de preparação enquanto os
+    bytes chegam, sem guardar o arquivo compactado. Só depois de conferir o
+    MD5 do arquivo e dos membros listados no catálogo o diretório substitui a
+    instalação anterior. Zips que não permitem extração em fluxo são baixados
+    inteiros antes.
+    """
+    archive_type = archives.archive_format(game)
+    final = catalog.install_dir(game)
+    staging = os.path.join(catalog.INSTALL_DIR, f".{game['id']}.staging")
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    try:
+        hash_md5 = hashlib.md5()
+        size = [0]
+
+        def counted(chunks):
+            for chunk in chunks:
+                size[0] += len(chunk)
+                yield chunk
+
+        chunks = counted(hashing(iter_download(urls, progress_callback, is_cancelled, **options), hash_md5))
+        try:
+            files = archives.extract_stream(chunks, archive_type, staging)
+        except archives.StreamingUnsupported as e:
+            log.warning(f"{game['file']}: {e}; baixando o arquivo inteiro antes de extrair")
+            chunks.close()
+            shutil.rmtree(staging)
+            os.makedirs(staging)
+            archive_path = staging + ".part"
+            size[0], md5 = download_file(urls, archive_path, progress_callback, is_cancelled, **options)
+            hash_md5 = None
+            try:
+                files = archives.extract_zip_file(archive_path, staging)
+            finally:
+                os.remove(archive_path)
+        md5 = hash_md5.hexdigest() if hash_md5 else md5
+
+        expected = game.get("md5")
+        if expected and md5 != expected:
+            raise ChecksumError(f"MD5 não confere: esperado {expected}, obtido {md5}")
+        for name, member_md5 in game.get("members", {}).items():
+            if files.get(name) != member_md5:
+                raise ChecksumError(f"MD5 de {name} não confere: esperado {member_md5}, obtido {files.get(name)}")
+
+        # Cabeçalhos locais do zip não trazem as permissões Unix
+        executable = os.path.join(staging, game["executable"])
+        if not os.path.isfile(executable):
+            raise archives.ArchiveError(f"Executável {game['executable']} não encontrado no arquivo")
+        os.chmod(executable, 0o755)
+
+        archives.commit_staging(staging, final)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    return size[0], md5, files
+
+
+def download_sources(game, peers):
+    """Lista (url, é_peer) na ordem de tentativa: peers da rede local e depois a origem
+
+    Peers só são usados quando o catálogo traz o md5 do jogo (no catálogo ou
+    fixado com `toolstaff hashes`), pois é ele que garante que o arquivo
+    recebido de outra máquina é o original, e para
+    executáveis avulsos (jogos em tar/zip não guardam o arquivo compactado).
+    """
+    sources = []
+    if game.get("md5") and not archives.archive_format(game):
+        sources.extend((url, True) for url in peer_cache.peer_urls(game, peers))
+    sources.append((catalog.download_urls(game), False))
+    return sources
+
+
+def install_game(game, progress_callback=None, is_cancelled=None, peers=None):
+    """Baixa, verifica e registra a instalação de um jogo do catálogo"""
+    config = load_config()
+    if peers is None:
+        peers = config["peers"]
+    os.makedirs(catalog.INSTALL_DIR, exist_ok=True)
+    destination = catalog.install_path(game)
+    expected = game.get("md5")
+    archive_type = archives.archive_format(game)
+
+    start = time.monotonic()
+    with storage.Reservation(game, config) as reservation:
+        for url, from_peer in download_sources(game, peers):
+            log.info(f"Iniciando download de {game['title']}: {url}")
+            options = {
+                "timeout": config["peer_timeout"] if from_peer else 30,
+                "stall_timeout": config["download_stall_timeout"],
+                "probe_timeout": config["mirror_probe_timeout"],
+                "on_size": reservation.require
+            }
+            try:
+                if archive_type:
+                    size, md5, members = install_archive(game, url, progress_callback, is_cancelled, **options)
+                else:
+                    size, md5 = download_file(url, destination, progress_callback, is_cancelled,
+                                              expected_md5=expected, **options)
+            except DownloadCancelled:
+                metrics.DOWNLOADS.inc(result="cancelled")
+                raise
+            except storage.InsufficientSpace:
+                metrics.DOWNLOADS.inc(result="no_space")
+                raise
+            except ChecksumError as e:
+                if from_peer:
+                    log.warning(f"MD5 do peer não confere para {game['title']} ({url}); descartado: {e}")
+                    continue
+                metrics.DOWNLOADS.inc(result="corrupt")
+                raise
+            except Exception as e:
+                if from_peer:
+                    log.warning(f"Peer indisponível para {game['title']} ({url}): {e}")
+                    continue
+                metrics.DOWNLOADS.inc(result="failed")
+                raise
+            break
+
+    elapsed = time.monotonic() - start
+    metrics.DOWNLOAD_DURATION.observe(elapsed)
+    metrics.DOWNLOAD_SOURCES.inc(source="peer" if from_peer else "origin")
+    if elapsed > 0:
+        metrics.DOWNLOAD_SPEED.set(round(size / (1024 * 1024) / elapsed, 2))
+
+    now = time.time()
+    if archive_type:
+        hashes = {f"{game['id']}/{name}": member_md5 for name, member_md5 in members.items()}
+    else:
+        hashes = {game["file"]: md5}
+    files = {}
+    for relpath, file_md5 in hashes.items():
+        st = os.stat(os.path.join(catalog.INSTALL_DIR, relpath))
+        files[relpath] = {
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "inode": st.st_ino,
+            "md5": file_md5,
+            "verified_at": now
+        }
+    record = install_records.update_record(
+        game["id"],
+        version=game["version"],
+        file=game["file"],
+        archive=archive_type,
+        size=size,
+        md5=md5,
+        source=url if from_peer else "origin",
+        installed_at=now,
+        files=files
+    )
+    metrics.DOWNLOADS.inc(result="ok")
+    log.info(f"{game['title']} {game['version']} instalado ({size / (1024 * 1024):.1f} MB, MD5 {md5})")
+    return record
+
+
+def outdated_games(games):
+    """Jogos instalados cuja versão registrada difere da versão do catálogo"""
+    records = install_records.load_records()
+    outdated = []
+    for game in games:
+        if not os.path.exists(catalog.install_path(game)):
+            continue
+        record = records.get(game["id"])
+        if record is None or record.get("version") != game["version"]:
+            outdated.append(game)
+    return outdated
@@ -0,0 +1,95 @@
+import os
+import json
+
+CONFIG_PATH = os.environ.get("TOOLSTAFF_CONFIG", "launcher_config.json")
+
+DEFAULTS = {
+    # Logs
+    "log_dir": "logs",
+    "log_file": "launcher.log",
+    "log_level": "INFO",
+    "log_max_bytes": 5 * 1024 * 1024,
+    "log_backup_count": 5,
+    "log_ring_size": 1000,
+
+    # Checagem de status
+    "status_budget": 3.0,
+    "status_min_free_mb": 1024,
+
+    # Métricas (porta 0 desativa o endpoint HTTP)
+    "metrics_host": "127.0.0.1",
+    "metrics_port": 9464,
+    "metrics_json_path": os.path.join("logs", "metrics.json"),
+    "metrics_json_interval": 30,
+
+    # Cache na rede local: outros launchers ("peers") consultados antes do
+    # GitHub, ex.: ["http://192.168.0.10:8765"]. Só é usado para jogos com md5
+    # no catálogo.
+    "peers": [],
+    "peer_timeout": 3,
+    "peer_cache_serve": False,
+    "peer_cache_host": "0.0.0.0",
+    "peer_cache_port": 8765,
+
+    # Downloads: segundos sem receber dados antes de trocar de espelho
+    "download_stall_timeout": 15,
+    "mirror_probe_timeout": 3,
+
+    # Armazenamento: cota total dos jogos instalados (0 = sem cota), espaço
+    # mínimo mantido livre e remoção dos jogos menos jogados quando faltar espaço
+    "install_quota_mb": 0,
+    "install_min_free_mb": 512,
+    "install_evict_lru": True,
+
+    # Pré-carregamento do jogo destacado no cache do sistema
+    "prefetch_enabled": True,
+    "prefetch_dwell_ms": 600,
+    "prefetch_max_mb": 512,
+
+    # Metadados dos jogos não instalados (tamanho real e links quebrados)
+    "metadata_ttl": 900,
+    "metadata_workers": 4,
+    "metadata_timeout": 5,
+    "metadata_check_latest": False,
+
+    # Interface: "tk" ou "pygame" (tela cheia com redesenho parcial)
+    "renderer": "tk",
+    "pygame_fullscreen": True,
+    "pygame_vsync": True,
+    "pygame_fps": 60,
+    # Tempo máximo por ciclo ocioso do Tk para o trabalho agendado da interface
+    "ui_frame_budget_ms": 8,
+    # Catálogo e imagens salvos no encerramento para acelerar a próxima abertura
+    "startup_snapshot_path": os.path.join("cache", "startup.snapshot"),
+    # Grava os eventos de entrada (JSON Lines) para reprodução com input_trace.py
+    "input_trace_path": None,
+    # Detector de travamentos do mainloop e efeitos sonoros
+    "stall_watchdog_enabled": True,
+    "audio_enabled": True,
+
+    # Memória: limite por cache em MB (despeja os itens menos usados), limite
+    # do processo inteiro e memória livre mínima no sistema (0 = sem limite).
+    # Ao passar de um destes dois, todos os caches são esvaziados.
+    "memory_budgets_mb": {"image_cache": 64, "card_surfaces": 64, "text_cache": 8, "sounds": 32},
+    "memory_rss_budget_mb": 0,
+    "memory_min_available_mb": 256,
+    "memory_check_interval": 10,
+    "memory_report_path": os.path.join("logs", "memory.json"),
+    # Snapshots do tracemalloc no relatório (deixa o launcher mais lento)
+    "memory_tracemalloc": False,
+    "memory_tracemalloc_top": 15,
+}
+
+
+def load_config(path=None):
+    """Carrega a configuração do launcher, completando com os valores padrão"""
+    config = dict(DEFAULTS)
+    path = path or CONFIG_PATH
+    try:
+        with open(path, encoding="utf-8") as f:
+            config.update(json.load(f))
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        print(f"Erro ao ler configuração {path}: {e}")
+    return config
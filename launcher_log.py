@@ -0,0 +1,158 @@
+import os
+import re
+import mmap
+import queue
+import logging
+import threading
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from launcher_config import load_config
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+
+_listener = None
+_ring_buffer = None
+_lock = threading.Lock()
+
+
+class RingBufferHandler(logging.Handler):
+    """Mantém as últimas mensagens em memória para consulta rápida"""
+
+    def __init__(self, capacity=1000):
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+
+    def emit(self, record):
+        try:
+            self.records.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+    def recent(self, count=None):
+        records = list(self.records)
+        return records if count is None else records[-count:]
+
+
+def log_path(config=None):
+    config = config or load_config()
+    return os.path.join(config["log_dir"], config["log_file"])
+
+
+def setup_logging(config=None):
+    """Configura o log do launcher: fila não bloqueante, arquivo rotativo e buffer em memória
+
+    Os handlers de arquivo e console rodam na thread do QueueListener, então
+    registrar uma mensagem nunca bloqueia a interface nem os downloads.
+    """
+    global _listener, _ring_buffer
+    with _lock:
+        if _listener is not None:
+            return _listener
+
+        config = config or load_config()
+        formatter = logging.Formatter(LOG_FORMAT)
+        os.makedirs(config["log_dir"], exist_ok=True)
+
+        file_handler = RotatingFileHandler(
+            log_path(config),
+            maxBytes=config["log_max_bytes"],
+            backupCount=config["log_backup_count"],
+            encoding="utf-8"
+        )
+        file_handler.setFormatter(formatter)
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+
+        _ring_buffer = RingBufferHandler(config["log_ring_size"])
+        _ring_buffer.setFormatter(formatter)
+
+        log_queue = queue.SimpleQueue()
+        root = logging.getLogger()
+        root.setLevel(config["log_level"])
+        root.addHandler(QueueHandler(log_queue))
+        root.addHandler(_ring_buffer)
+
+        _listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+        _listener.start()
+        return _listener
+
+
+def shutdown_logging():
+    """Esvazia a fila e fecha os arquivos de log"""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def recent_logs(count=None):
+    """Últimas mensagens guardadas no buffer em memória"""
+    if _ring_buffer is None:
+        return []
+    return _ring_buffer.recent(count)
+
+
+def line_level(line):
+    """Nível de uma linha no formato LOG_FORMAT, ou None (ex.: linhas de traceback)"""
+    parts = line.split(" ", 3)
+    if len(parts) >= 3 and parts[2] in LEVELS:
+        return parts[2]
+    return None
+
+
+def _matches(line, pattern, min_level):
+    if pattern is not None and not pattern.search(line):
+        return False
+    if min_level is not None:
+        level = line_level(line)
+        if level is None or LEVELS.index(level) < min_level:
+            return False
+    return True
+
+
+def _reverse_lines(path):
+    """Percorre as linhas de um arquivo de trás para frente via mmap, sem carregá-lo inteiro"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            end = len(data)
+            if data[end - 1:end] == b"\n":
+                end -= 1
+            while end > 0:
+                start = data.rfind(b"\n", 0, end) + 1
+                yield data[start:end].decode("utf-8", "replace").rstrip("\r")
+                end = start - 1
+
+
+def tail_logs(count=50, grep=None, level=None, path=None):
+    """Devolve as últimas `count` linhas que passam nos filtros, da mais antiga à mais nova
+
+    Os arquivos rotacionados (.1, .2, ...) são lidos em seguida quando o
+    arquivo atual não tem linhas suficientes.
+    """
+    if count <= 0:
+        return []
+    path = path or log_path()
+    pattern = re.compile(grep, re.IGNORECASE) if grep else None
+    min_level = LEVELS.index(level.upper()) if level else None
+
+    files = [path]
+    index = 1
+    while os.path.exists(f"{path}.{index}"):
+        files.append(f"{path}.{index}")
+        index += 1
+
+    lines = []
+    for filename in files:
+        if not os.path.exists(filename):
+            continue
+        for line in _reverse_lines(filename):
+            if _matches(line, pattern, min_level):
+                lines.append(line)
+                if len(lines) >= count:
+                    return lines[::-1]
+    return lines[::-1]
@@ -1,29 +1,120 @@
 import os
-import requests
+import argparse
 import tkinter as tk
 from tkinter import ttk, messagebox
 import threading
-import subprocess
-import pygame
-from pygame.locals import *
-from PIL import Image, ImageTk
 import time
+import gc
+import logging
+from collections import OrderedDict
+import process_priority
+from stall_watchdog import StallWatchdog
+from process_supervisor import ProcessSupervisor
+import startup_snapshot
+import catalog
+import installer
+import metrics
+import peer_cache
+import prefetch
+import metadata
+import storage
+import memory_budget
+import ui_scheduler
+import input_trace
+from launcher_config import load_config
+from launcher_log import setup_logging, shutdown_logging
+
+log = logging.getLogger("launcher")
+
+# Teclado: mesmas ações dos botões do controle
+KEY_ACTIONS = {
+    "Up": "up",
+    "Down": "down",
+    "Return": "confirm",
+    "KP_Enter": "confirm",
+    "Escape": "back",
+    "BackSpace": "back"
+}
+
+# requests, pygame e PIL são importados sob demanda para acelerar a abertura
 
 class GameLauncher:
-    def __init__(self, root):
-        # Configuração inicial do mixer de áudio
-        pygame.mixer.pre_init(44100, -16, 2, 2048)
-        pygame.init()
-        
+    def __init__(self, root, config=None):
+        self.startup_marks = {"init": time.perf_counter()}
         self.root = root
+        self.config = config or load_config()
+        self.trace_recorder = None
+        if self.config["input_trace_path"]:
+            self.trace_recorder = input_trace.TraceRecorder(self.config["input_trace_path"])
+        self.metrics_exporter = None
+        self.peer_cache_server = None
+        self.prefetcher = None
+        self.prefetch_after_id = None
+        self.metadata = metadata.MetadataCache(ttl=self.config["metadata_ttl"],
+                                               max_workers=self.config["metadata_workers"],
+                                               timeout=self.config["metadata_timeout"],
+                                               check_latest=self.config["metadata_check_latest"])
+        self.memory = memory_budget.accountant_from_config(self.config)
+        self.scheduler = ui_scheduler.UIScheduler(root, self.config["ui_frame_budget_ms"] / 1000)
+        self.card_details = {}
+        self.game_process = None
+        self.supervisor = ProcessSupervisor(on_ready=self.on_game_ready, on_exit=self.on_game_exit)
+        self.joystick = None
+        self.pygame_ready = False
         self.setup_variables()
-        self.setup_window()
         self.load_assets()
+        self.setup_window()
+        self.show_splash()
+
+        # Pinta a janela mínima antes de qualquer trabalho pesado
+        self.root.update()
+        self.startup_marks["first_paint"] = time.perf_counter()
+        self.root.after_idle(self.finish_startup)
+
+    def finish_startup(self):
+        """Inicializa os subsistemas e monta o menu após a primeira pintura"""
+        self.init_pygame()
         self.setup_joystick()
+        self.load_startup_snapshot()
         self.setup_main_menu()
         self.start_control_thread()
-        self.game_process = None
+        self.startup_marks["menu_ready"] = time.perf_counter()
+
+        # Trabalho não crítico fica para quando a interface estiver ociosa
+        self.root.after_idle(self.finish_deferred_startup)
+
+    def finish_deferred_startup(self):
+        """Executa as tarefas de inicialização que não bloqueiam o menu"""
+        self.init_audio()
+        self.set_window_icon()
+        self.start_stall_watchdog()
+        self.metrics_exporter = metrics.exporter_from_config(self.config).start()
+        self.peer_cache_server = peer_cache.server_from_config(self.config)
+        if self.config["prefetch_enabled"]:
+            self.prefetcher = prefetch.Prefetcher(self.config["prefetch_max_mb"] * 1024 * 1024)
+        self.setup_memory_accounting()
         self.play_sound("startup")
+        self.startup_marks["deferred_ready"] = time.perf_counter()
+
+    def init_pygame(self):
+        """Importa o pygame e inicializa apenas o subsistema de controle"""
+        try:
+            import pygame
+            pygame.joystick.init()
+            self.pygame_ready = True
+        except Exception as e:
+            log.error(f"Erro ao inicializar pygame: {e}")
+
+    def init_audio(self):
+        """Inicializa somente o mixer de áudio"""
+        if not self.pygame_ready or not self.config["audio_enabled"]:
+            return
+        try:
+            import pygame
+            pygame.mixer.pre_init(44100, -16, 2, 2048)
+            pygame.mixer.init()
+        except Exception as e:
+            log.error(f"Erro ao inicializar áudio: {e}")
 
     def setup_variables(self):
         """Inicializa todas as variáveis necessárias"""
@@ -35,26 +126,13 @@ class GameLauncher:
         self.game_cards = []
         self.menu_options = []
         self.menu_widgets = []
-        self.games = [
-            {
-                "title": "Target Game",
-                "version": "v2.0",
-                "size": "45 MB",
-                "file": "target_game.exe",
-                "repo": "gu2121gg/Projeto-Xemuloter",
-                "installed": os.path.exists("TargetGame/target_game.exe"),
-                "cover": os.path.join("assets", "games", "game1.jpg")
-            },
-            {
-                "title": "PS2 Emulator",
-                "version": "v1.5",
-                "size": "15 MB",
-                "file": "ps2_emulator.exe",
-                "repo": "gu2121gg/Projeto-Xemuloter",
-                "installed": False,
-                "cover": os.path.join("assets", "icons", "opl_logo.png")
-            }
-        ]
+        self.image_cache = OrderedDict()
+        self.sound_cache = OrderedDict()
+        self.game_covers = {}
+        self.menu_icons = []
+        self.suspended = False
+        self.priority_state = None
+        self.games = catalog.load_catalog()
 
     def setup_window(self):
         """Configura a janela principal"""
@@ -63,16 +141,30 @@ class GameLauncher:
         self.root.configure(bg="#1a1a1a")
         self.root.resizable(True, True)
         self.root.minsize(1024, 576)
-        
+        self.center_window()
+        self.root.bind("<Key>", self.handle_keypress)
+
+    def set_window_icon(self):
+        """Define o ícone da janela"""
         try:
-            icon_path = os.path.join("assets", "icons", "game_icon.png")
+            from PIL import Image, ImageTk
+            icon_path = catalog.ICONS[0]
             icon = Image.open(icon_path)
-            photo = ImageTk.PhotoImage(icon)
-            self.root.iconphoto(False, photo)
+            self.window_icon = ImageTk.PhotoImage(icon)
+            self.root.iconphoto(False, self.window_icon)
         except Exception as e:
-            print(f"Erro ao carregar ícone: {e}")
-            
-        self.center_window()
+            log.error(f"Erro ao carregar ícone: {e}")
+
+    def show_splash(self):
+        """Mostra uma tela mínima enquanto o launcher carrega"""
+        self.current_screen = "loading"
+        splash = tk.Frame(self.root, bg=self.colors["bg"])
+        splash.pack(fill="both", expand=True)
+        tk.Label(splash,
+                text="Carregando...",
+                font=("Arial", 24),
+                bg=self.colors["bg"],
+                fg=self.colors["disabled"]).place(relx=0.5, rely=0.5, anchor="center")
 
     def center_window(self):
         """Centraliza a janela na tela"""
@@ -96,39 +188,44 @@ class GameLauncher:
         }
         
         # Configuração dos sons
-        self.sounds = {
-            "back": os.path.join("assets", "audio", "back.wav"),
-            "confirm": os.path.join("assets", "audio", "confirm.wav"),
-            "navigate": os.path.join("assets", "audio", "navigate.wav"),
-            "select": os.path.join("assets", "audio", "select.wav"),
-            "startup": os.path.join("assets", "audio", "startup.wav")
-        }
+        self.sounds = dict(catalog.SOUNDS)
 
     def play_sound(self, sound_name):
         """Toca um efeito sonoro"""
+        if not self.pygame_ready or not self.config["audio_enabled"]:
+            return
         try:
+            import pygame
             if sound_name in self.sounds:
                 sound_path = self.sounds[sound_name]
-                if os.path.exists(sound_path):
+                sound = self.sound_cache.get(sound_name)
+                if sound is not None:
+                    self.sound_cache.move_to_end(sound_name)
+                    sound.play()
+                elif os.path.exists(sound_path):
                     sound = pygame.mixer.Sound(sound_path)
                     sound.set_volume(0.5)
+                    self.sound_cache[sound_name] = sound
                     sound.play()
                 else:
-                    print(f"Arquivo de som não encontrado: {sound_path}")
+                    log.warning(f"Arquivo de som não encontrado: {sound_path}")
             else:
-                print(f"Som não definido: {sound_name}")
+                log.warning(f"Som não definido: {sound_name}")
         except Exception as e:
-            print(f"Erro ao tocar som {sound_name}: {e}")
+            log.error(f"Erro ao tocar som {sound_name}: {e}")
 
     def setup_joystick(self):
         """Configura o controle PS2"""
+        if not self.pygame_ready:
+            return
         try:
-            pygame.joystick.init()
-            
+            import pygame
             if pygame.joystick.get_count() > 0:
+                # A fila de eventos do pygame depende do subsistema de vídeo
+                pygame.display.init()
                 self.joystick = pygame.joystick.Joystick(0)
                 self.joystick.init()
-                print(f"Controle conectado: {self.joystick.get_name()}")
+                log.info(f"Controle conectado: {self.joystick.get_name()}")
                 
                 # Configuração dos botões específicos para controles PS2
                 self.button_map = {
@@ -143,17 +240,124 @@ class GameLauncher:
                 }
             else:
                 self.joystick = None
-                print("Conecte um controle PS2")
+                log.warning("Conecte um controle PS2")
                 
         except Exception as e:
-            print(f"Erro no controle: {e}")
+            log.error(f"Erro no controle: {e}")
             self.joystick = None
 
+    def load_image(self, path, size):
+        """Devolve uma PhotoImage redimensionada usando o cache de imagens"""
+        from PIL import Image, ImageTk
+        key = (path, size[0], size[1])
+        image = self.image_cache.get(key)
+        if image is None:
+            image = Image.open(path).convert("RGBA").resize(size, Image.LANCZOS)
+            self.image_cache[key] = image
+        else:
+            self.image_cache.move_to_end(key)
+        return ImageTk.PhotoImage(image)
+
+    def menu_icon_path(self, option):
+        """Caminho do ícone de uma opção do menu principal"""
+        icon_name = option.lower().replace("ç", "c").replace("õ", "o") + "_icon.png"
+        return os.path.join("assets", "icons", icon_name)
+
+    def startup_images(self):
+        """Lista (caminho, tamanho) de todas as imagens usadas pelos menus"""
+        images = [(os.path.join("assets", "icons", "opl_logo.png"), (300, 150)),
+                  (os.path.join("assets", "icons", "back_icon.png"), (25, 25))]
+        images += [(self.menu_icon_path(option), (30, 30)) for option in self.menu_options]
+        images += [(game["cover"], (120, 120)) for game in self.games]
+        return images
+
+    def snapshot_sources(self):
+        """Arquivos que invalidam o catálogo salvo no snapshot"""
+        return ([os.path.abspath(catalog.__file__), os.path.abspath(catalog.HASHES_PATH)]
+                + [catalog.install_path(game) for game in self.games])
+
+    def load_startup_snapshot(self):
+        """Reaproveita catálogo e imagens salvos no último encerramento"""
+        try:
+            games, images = startup_snapshot.load_snapshot(self.snapshot_sources(),
+                                                           self.config["startup_snapshot_path"])
+        except Exception as e:
+            log.error(f"Erro ao carregar snapshot de inicialização: {e}")
+            return
+        if games is not None:
+            self.games = games
+        self.image_cache.update(images)
+
+    def save_startup_snapshot(self):
+        """Salva catálogo, estado de instalação e imagens redimensionadas"""
+        for path, size in self.startup_images():
+            if os.path.exists(path):
+                try:
+                    self.load_image(path, size)
+                except Exception as e:
+                    log.error(f"Erro ao preparar imagem {path}: {e}")
+        try:
+            startup_snapshot.save_snapshot(self.games, self.snapshot_sources(), self.image_cache,
+                                           self.config["startup_snapshot_path"])
+        except Exception as e:
+            log.error(f"Erro ao salvar snapshot de inicialização: {e}")
+
     def start_control_thread(self):
         """Inicia a thread de controle"""
         self.control_thread = threading.Thread(target=self.control_loop, daemon=True)
         self.control_thread.start()
 
+    def setup_memory_accounting(self):
+        """Registra os caches do launcher na contabilidade de memória"""
+        def evict_images(limit):
+            memory_budget.trim_lru(self.image_cache, limit, memory_budget.pil_image_bytes)
+
+        def evict_sounds(limit):
+            memory_budget.trim_lru(self.sound_cache, limit, self.sound_bytes)
+
+        self.memory.register("image_cache", lambda: memory_budget.cache_usage(
+            self.image_cache, memory_budget.pil_image_bytes), evict_images)
+        self.memory.register("sounds", lambda: memory_budget.cache_usage(
+            self.sound_cache, self.sound_bytes), evict_sounds)
+        self.memory.register("widgets", self.widget_tree_usage)
+        self.memory.register("downloads", installer.buffer_usage)
+        self.root.after(self.config["memory_check_interval"] * 1000, self.check_memory)
+
+    def sound_bytes(self, sound):
+        import pygame
+        return memory_budget.sound_bytes(sound, pygame.mixer.get_init())
+
+    def widget_tree_usage(self):
+        """Imagens vivas no Tk (bytes, em RGBA) e quantidade de widgets"""
+        widgets = 0
+        pending = [self.root]
+        while pending:
+            widget = pending.pop()
+            widgets += 1
+            pending.extend(widget.winfo_children())
+        size = 0
+        for name in self.root.tk.splitlist(self.root.tk.call("image", "names")):
+            width = int(self.root.tk.call("image", "width", name))
+            height = int(self.root.tk.call("image", "height", name))
+            size += width * height * 4
+        return size, widgets
+
+    def check_memory(self):
+        """Mede a memória de cada subsistema e despeja caches acima do limite"""
+        if not self.running:
+            return
+        self.memory.check()
+        self.root.after(self.config["memory_check_interval"] * 1000, self.check_memory)
+
+    def start_stall_watchdog(self):
+        """Inicia o detector de travamentos do mainloop"""
+        if not self.config["stall_watchdog_enabled"]:
+            return
+        self.stall_watchdog = StallWatchdog(self.root,
+                                            context=lambda: self.current_screen,
+                                            on_stall=lambda stall: metrics.UI_STALLS.inc())
+        self.stall_watchdog.start()
+
     def setup_main_menu(self):
         """Configura o menu principal"""
         self.clear_screen()
@@ -165,13 +369,11 @@ class GameLauncher:
 
         try:
             logo_path = os.path.join("assets", "icons", "opl_logo.png")
-            logo_img = Image.open(logo_path)
-            logo_img = logo_img.resize((300, 150), Image.LANCZOS)
-            self.opl_logo = ImageTk.PhotoImage(logo_img)
+            self.opl_logo = self.load_image(logo_path, (300, 150))
             logo_label = tk.Label(main_frame, image=self.opl_logo, bg=self.colors["bg"])
             logo_label.pack(pady=(40, 20))
         except Exception as e:
-            print(f"Erro ao carregar logo: {e}")
+            log.error(f"Erro ao carregar logo: {e}")
             tk.Label(main_frame, 
                     text="GAME LAUNCHER",
                     font=("Arial", 36, "bold"),
@@ -186,16 +388,12 @@ class GameLauncher:
             frame.pack(pady=5)
             
             try:
-                icon_name = option.lower().replace("ç", "c").replace("õ", "o") + "_icon.png"
-                icon_path = os.path.join("assets", "icons", icon_name)
-                icon_img = Image.open(icon_path)
-                icon_img = icon_img.resize((30, 30), Image.LANCZOS)
-                icon = ImageTk.PhotoImage(icon_img)
+                icon = self.load_image(self.menu_icon_path(option), (30, 30))
                 icon_label = tk.Label(frame, image=icon, bg=self.colors["bg"])
-                icon_label.image = icon
+                self.menu_icons.append(icon)
                 icon_label.pack(side="left", padx=10)
             except Exception as e:
-                print(f"Erro ao carregar ícone {option}: {e}")
+                log.error(f"Erro ao carregar ícone {option}: {e}")
                 selector = tk.Label(frame, text="▶", 
                                  font=("Arial", 16),
                                  bg=self.colors["bg"],
@@ -247,9 +445,7 @@ class GameLauncher:
 
         try:
             back_icon_path = os.path.join("assets", "icons", "back_icon.png")
-            back_icon = Image.open(back_icon_path)
-            back_icon = back_icon.resize((25, 25), Image.LANCZOS)
-            self.back_icon_img = ImageTk.PhotoImage(back_icon)
+            self.back_icon_img = self.load_image(back_icon_path, (25, 25))
             back_btn = tk.Button(header, 
                                image=self.back_icon_img,
                                command=self.back_to_main,
@@ -259,7 +455,7 @@ class GameLauncher:
                                activebackground="#3a3a3a")
             back_btn.pack(side="left", padx=10, pady=5)
         except Exception as e:
-            print(f"Erro ao carregar ícone de voltar: {e}")
+            log.error(f"Erro ao carregar ícone de voltar: {e}")
             back_btn = tk.Button(header, 
                                text="← Voltar",
                                command=self.back_to_main,
@@ -293,6 +489,12 @@ class GameLauncher:
         self.games_canvas = canvas
 
         self.game_cards = []
+        self.card_details = {}
+        # Os cards são montados aos poucos para não travar a navegação em catálogos grandes
+        self.scheduler.run_steps("games_menu", self.build_game_cards(scrollable_frame))
+
+    def build_game_cards(self, scrollable_frame):
+        """Monta um card de jogo a cada passo do agendador da interface"""
         for i, game in enumerate(self.games):
             card = tk.Frame(scrollable_frame,
                           bg=self.colors["card"],
@@ -305,16 +507,11 @@ class GameLauncher:
             card.grid_columnconfigure(1, weight=3)
 
             try:
-                cover_path = game["cover"]
-                cover_img = Image.open(cover_path)
-                cover_img = cover_img.resize((120, 120), Image.LANCZOS)
-                if not hasattr(self, 'game_covers'):
-                    self.game_covers = {}
-                self.game_covers[i] = ImageTk.PhotoImage(cover_img)
+                self.game_covers[i] = self.load_image(game["cover"], (120, 120))
                 cover_label = tk.Label(card, image=self.game_covers[i], bg=self.colors["card"])
                 cover_label.grid(row=0, column=0, rowspan=3, padx=10, pady=5, sticky="nsew")
             except Exception as e:
-                print(f"Erro ao carregar capa do jogo {game['title']}: {e}")
+                log.error(f"Erro ao carregar capa do jogo {game['title']}: {e}")
                 tk.Label(card, 
                         text="Sem Imagem",
                         font=("Arial", 10),
@@ -330,11 +527,12 @@ class GameLauncher:
                     bg=self.colors["card"],
                     fg=self.colors["text"]).pack(anchor="w")
 
-            tk.Label(info_frame, 
-                    text=f"Versão: {game['version']} | Tamanho: {game['size']}",
-                    font=("Arial", 12),
-                    bg=self.colors["card"],
-                    fg=self.colors["disabled"]).pack(anchor="w", pady=5)
+            details_label = tk.Label(info_frame,
+                                     text=f"Versão: {game['version']} | Tamanho: {game['size']}",
+                                     font=("Arial", 12),
+                                     bg=self.colors["card"],
+                                     fg=self.colors["disabled"])
+            details_label.pack(anchor="w", pady=5)
 
             btn_frame = tk.Frame(card, bg=self.colors["card"])
             btn_frame.grid(row=1, column=1, sticky="e", padx=10)
@@ -354,6 +552,37 @@ class GameLauncher:
             action_btn.pack(pady=10, ipady=5)
 
             self.game_cards.append(card)
+            self.card_details[game["id"]] = (details_label, action_btn)
+            yield
+
+        self.schedule_prefetch()
+
+        # Tamanho real e disponibilidade dos jogos não instalados, sem bloquear a interface
+        self.metadata.request([game for game in self.games if not game["installed"]],
+                              lambda game_id, info: self.scheduler.post(self.apply_metadata, game_id, info,
+                                                                        key=("metadata", game_id)))
+
+    def apply_metadata(self, game_id, info):
+        """Atualiza o card de um jogo com os metadados consultados"""
+        widgets = self.card_details.get(game_id)
+        game = catalog.find_game(self.games, game_id)
+        if self.current_screen != "games" or widgets is None or game is None:
+            return
+        details_label, action_btn = widgets
+        if not details_label.winfo_exists():
+            return
+
+        if info["size"]:
+            game["size"] = metadata.format_size(info["size"])
+        text = f"Versão: {game['version']} | Tamanho: {game['size']}"
+        if info["latest_version"] and info["latest_version"] != game["version"]:
+            text += f" | Nova versão: {info['latest_version']}"
+        if not info["available"]:
+            details_label.config(text=text + " | Download indisponível", fg=self.colors["highlight"])
+            if not game["installed"]:
+                action_btn.config(text="INDISPONÍVEL", state="disabled", bg=self.colors["disabled"])
+        else:
+            details_label.config(text=text)
 
     def play_or_download(self, game):
         """Decide se executa ou baixa o jogo"""
@@ -381,20 +610,114 @@ class GameLauncher:
                                padx=30,
                                pady=10)
             back_btn.place(relx=0.5, rely=0.9, anchor="center")
+
+            self.game_status_label = tk.Label(game_frame,
+                                            text=f"Iniciando {game['title']}...",
+                                            font=("Arial", 14),
+                                            bg=self.colors["bg"],
+                                            fg=self.colors["disabled"])
+            self.game_status_label.place(relx=0.5, rely=0.5, anchor="center")
             
-            self.game_process = subprocess.Popen([f"TargetGame/{game['file']}"])
+            self.game_process = self.supervisor.launch([catalog.install_path(game)], name=game["title"],
+                                                       game_id=game["id"])
+            storage.mark_played(game["id"], time.time())
+            metrics.GAME_LAUNCHES.inc(game=game["id"])
+            metrics.GAMES_RUNNING.inc()
+            self.enter_background_mode()
+            self.update_game_status()
             
         except Exception as e:
             messagebox.showerror("Erro", f"Não foi possível iniciar o jogo:\n{e}")
             self.setup_games_menu()
 
+    def update_game_status(self):
+        """Mostra o consumo do jogo em execução"""
+        proc = self.game_process
+        if self.current_screen != "in_game" or proc is None or not proc.running:
+            return
+        stats = proc.stats()
+        state = "Em execução" if proc.ready_at is not None else "Carregando"
+        self.game_status_label.config(
+            text=f"{proc.name}: {state} | CPU {stats['cpu_percent']:.0f}% | RAM {stats['rss_mb']:.0f} MB")
+        self.root.after(1000, self.update_game_status)
+
+    def on_game_ready(self, proc):
+        """Chamado pelo supervisor quando o jogo termina de carregar"""
+        log.info(f"{proc.name} pronto em {proc.launch_to_ready:.2f}s")
+        metrics.GAME_READY.observe(proc.launch_to_ready)
+
+    def on_game_exit(self, proc):
+        """Chamado pelo supervisor (em outra thread) quando o jogo encerra"""
+        if proc.crashed:
+            result = "crashed"
+        elif proc.killed:
+            result = "killed"
+        elif proc.stop_requested:
+            result = "stopped"
+        else:
+            result = "ok"
+        metrics.GAME_EXITS.inc(game=proc.game_id, result=result)
+        metrics.GAMES_RUNNING.dec()
+        if self.running:
+            self.scheduler.post(self.handle_game_exit, proc)
+
+    def handle_game_exit(self, proc):
+        """Volta para a lista de jogos quando o jogo encerra sozinho"""
+        if proc is not self.game_process:
+            return
+        self.game_process = None
+        self.exit_background_mode()
+        if proc.crashed:
+            messagebox.showerror("Erro", f"{proc.name} encerrou inesperadamente (código {proc.exit_code}).")
+        if self.current_screen == "in_game":
+            self.setup_games_menu()
+
     def back_to_main_from_game(self):
         """Volta ao menu principal durante o jogo"""
         if self.game_process:
-            self.game_process.terminate()
+            self.supervisor.terminate(self.game_process)
             self.game_process = None
+        self.exit_background_mode()
         self.setup_main_menu()
 
+    def enter_background_mode(self):
+        """Libera CPU e memória para o jogo enquanto ele estiver rodando"""
+        if self.suspended:
+            return
+        self.suspended = True
+
+        if hasattr(self, "stall_watchdog"):
+            self.stall_watchdog.stop()
+        if self.pygame_ready:
+            import pygame
+            # Os sons em cache deixam de valer sem o mixer
+            self.sound_cache.clear()
+            pygame.mixer.quit()
+
+        # Descarta imagens; os menus recarregam do snapshot ao voltar
+        self.image_cache.clear()
+        self.game_covers = {}
+        self.menu_icons = []
+        self.opl_logo = None
+        self.back_icon_img = None
+        gc.collect()
+
+        self.cancel_prefetch()
+        self.priority_state = process_priority.lower_priority()
+
+    def exit_background_mode(self):
+        """Restaura prioridade, áudio e imagens quando o jogo termina"""
+        if not self.suspended:
+            return
+        self.suspended = False
+
+        process_priority.restore_priority(self.priority_state)
+        self.priority_state = None
+        self.init_audio()
+        self.load_startup_snapshot()
+        if hasattr(self, "stall_watchdog"):
+            self.stall_watchdog.start()
+
     def download_game(self, game):
         """Inicia o download do jogo"""
         if self.downloading:
@@ -444,41 +767,25 @@ class GameLauncher:
     def execute_download(self, game, window):
         """Executa o download em segundo plano"""
         try:
-            os.makedirs("TargetGame", exist_ok=True)
-            destination = f"TargetGame/{game['file']}"
-            url = f"https://github.com/{game['repo']}/releases/download/{game['version']}/{game['file']}"
-            
-            with requests.get(url, stream=True) as response:
-                response.raise_for_status()
-                total_size = int(response.headers.get('content-length', 0))
-                downloaded = 0
-                start_time = time.time()
-                
-                with open(destination, 'wb') as file:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if not self.downloading:
-                            file.close()
-                            os.remove(destination)
-                            raise Exception("Download cancelado")
-                            
-                        if chunk:
-                            file.write(chunk)
-                            downloaded += len(chunk)
-                            progress = (downloaded / total_size) * 100
-                            elapsed = time.time() - start_time
-                            speed = (downloaded / (1024 * 1024)) / elapsed if elapsed > 0 else 0
-                            
-                            window.after(0, self.update_download_ui, progress, downloaded, total_size, speed)
-            
-            window.after(0, lambda: self.download_complete(window, game))
-            
+            def progress_callback(progress, downloaded, total, speed):
+                # Só a atualização mais recente fica na fila
+                self.scheduler.post(self.update_download_ui, progress, downloaded, total, speed,
+                                    key="download_progress")
+
+            installer.install_game(game, progress_callback, is_cancelled=lambda: not self.downloading)
+            self.scheduler.post(self.download_complete, window, game)
+
+        except installer.DownloadCancelled:
+            log.info(f"Download de {game['title']} cancelado")
         except Exception as e:
-            window.after(0, lambda: self.download_failed(window, str(e)))
+            self.scheduler.post(self.download_failed, window, str(e))
         finally:
             self.downloading = False
 
     def update_download_ui(self, progress, downloaded, total, speed):
         """Atualiza a interface do download"""
+        if not self.status_label.winfo_exists():
+            return
         self.progress_var.set(progress)
         self.status_label.config(text=f"Download: {progress:.1f}% completo")
         downloaded_mb = downloaded / (1024 * 1024)
@@ -487,13 +794,17 @@ class GameLauncher:
 
     def download_complete(self, window, game):
         """Finaliza o download com sucesso"""
+        log.info(f"{game['title']} instalado com sucesso")
         window.destroy()
         messagebox.showinfo("Sucesso", f"{game['title']} instalado com sucesso!")
-        self.games[0]["installed"] = True  # Atualiza status de instalação
+        # Atualiza o status de instalação (outros jogos podem ter sido removidos para liberar espaço)
+        for item in self.games:
+            item["installed"] = os.path.exists(catalog.install_path(item))
         self.setup_games_menu()
 
     def download_failed(self, window, error):
         """Mostra erro no download"""
+        log.error(f"Falha no download: {error}")
         window.destroy()
         messagebox.showerror("Erro", f"Falha no download:\n{error}")
 
@@ -510,32 +821,75 @@ class GameLauncher:
 
     def clear_screen(self):
         """Limpa a tela"""
+        self.scheduler.cancel("games_menu")
         for widget in self.root.winfo_children():
             widget.destroy()
+        # Solta as imagens dos widgets destruídos para o Tk liberá-las
+        self.game_covers = {}
+        self.menu_icons = []
 
     def control_loop(self):
         """Loop principal para controle do PS2"""
+        if not self.pygame_ready:
+            return
+        import pygame
         clock = pygame.time.Clock()
         
         while self.running:
-            clock.tick(30)
-            
             if not self.joystick:
                 time.sleep(0.1)
                 continue
+
+            if self.suspended:
+                # Durante o jogo só o botão de voltar é verificado, a 4 Hz
+                clock.tick(4)
+                for event in pygame.event.get():
+                    if event.type == pygame.JOYBUTTONDOWN and event.button == self.button_map['circle']:
+                        self.post_input("back")
+                continue
+
+            clock.tick(30)
                 
             for event in pygame.event.get():
-                if event.type == JOYHATMOTION:
+                if event.type == pygame.JOYHATMOTION:
                     if event.value[1] == 1:  # Cima
-                        self.move_selection(-1)
+                        self.post_input("up")
                     elif event.value[1] == -1:  # Baixo
-                        self.move_selection(1)
+                        self.post_input("down")
                         
-                elif event.type == JOYBUTTONDOWN:
+                elif event.type == pygame.JOYBUTTONDOWN:
                     if event.button == self.button_map['x']:  # Botão X (confirmar)
-                        self.select_item()
+                        self.post_input("confirm")
                     elif event.button == self.button_map['circle']:  # Botão O (voltar)
-                        self.back_action()
+                        self.post_input("back")
+
+    def post_input(self, action):
+        """Repassa um evento do controle para a thread do Tk, à frente do trabalho pendente"""
+        if self.trace_recorder:
+            self.trace_recorder.record("joystick", action, self.current_screen)
+        self.scheduler.post(self.dispatch_input, "joystick", action, priority=ui_scheduler.INPUT)
+
+    def handle_keypress(self, event):
+        """Setas navegam, Enter confirma, Esc e Backspace voltam"""
+        action = KEY_ACTIONS.get(event.keysym)
+        if action is None:
+            return
+        if self.trace_recorder:
+            self.trace_recorder.record("keyboard", action, self.current_screen)
+        self.dispatch_input("keyboard", action)
+
+    def dispatch_input(self, source, action):
+        """Executa a ação de um evento de entrada e mede o tempo de processamento"""
+        handlers = {
+            "up": lambda: self.move_selection(-1),
+            "down": lambda: self.move_selection(1),
+            "confirm": self.select_item,
+            "back": self.back_action
+        }
+        start = time.perf_counter()
+        handlers[action]()
+        metrics.INPUT_HANDLING.observe(time.perf_counter() - start)
+        metrics.INPUT_EVENTS.inc(source=source, action=action)
 
     def move_selection(self, direction):
         """Move a seleção no menu"""
@@ -560,6 +914,29 @@ class GameLauncher:
                 self.games_canvas.yview_moveto(self.selected_card_index / len(self.game_cards))
                 
                 self.play_sound("navigate")
+                self.schedule_prefetch()
+
+    def schedule_prefetch(self):
+        """Pré-carrega o jogo destacado se a seleção ficar parada por um tempo"""
+        if self.prefetcher is None:
+            return
+        self.cancel_prefetch()
+        self.prefetch_after_id = self.root.after(self.config["prefetch_dwell_ms"], self.prefetch_selected)
+
+    def cancel_prefetch(self):
+        if self.prefetch_after_id is not None:
+            self.root.after_cancel(self.prefetch_after_id)
+            self.prefetch_after_id = None
+        if self.prefetcher is not None:
+            self.prefetcher.cancel()
+
+    def prefetch_selected(self):
+        self.prefetch_after_id = None
+        if self.current_screen != "games" or self.selected_card_index >= len(self.games):
+            return
+        game = self.games[self.selected_card_index]
+        if game["installed"]:
+            self.prefetcher.request(game)
 
     def select_item(self):
         """Processa a seleção atual"""
@@ -568,7 +945,7 @@ class GameLauncher:
             if self.menu_options[self.selected_index] == "Jogos":
                 self.setup_games_menu()
             elif self.menu_options[self.selected_index] == "Sair":
-                self.root.quit()
+                self.on_closing()
                 
         elif self.current_screen == "games":
             if self.game_cards:
@@ -584,32 +961,64 @@ class GameLauncher:
         elif self.current_screen == "games":
             self.back_to_main()
         elif self.current_screen == "main_menu":
-            self.root.quit()
+            self.on_closing()
 
     def on_closing(self):
         """Lida com o fechamento da janela"""
-        if self.game_process:
-            self.game_process.terminate()
+        self.save_startup_snapshot()
         self.running = False
-        pygame.quit()
+        if self.prefetcher:
+            self.prefetcher.stop()
+        self.metadata.shutdown()
+        self.supervisor.shutdown()
+        if self.metrics_exporter:
+            self.metrics_exporter.stop()
+        if self.peer_cache_server:
+            self.peer_cache_server.stop()
+        if hasattr(self, "stall_watchdog"):
+            self.stall_watchdog.stop()
+        if self.trace_recorder:
+            self.trace_recorder.close()
+        if self.pygame_ready:
+            import pygame
+            pygame.quit()
         self.root.destroy()
+        shutdown_logging()
 
 if __name__ == "__main__":
+    setup_logging()
+
     # Verifica e cria a estrutura de diretórios necessária
     required_dirs = [
         "assets",
         os.path.join("assets", "audio"),
         os.path.join("assets", "games"),
         os.path.join("assets", "icons"),
-        "TargetGame"
+        "TargetGame",
+        "logs"
     ]
     
     for directory in required_dirs:
         if not os.path.exists(directory):
             os.makedirs(directory)
-            print(f"Diretório criado: {directory}")
+            log.info(f"Diretório criado: {directory}")
     
-    root = tk.Tk()
-    app = GameLauncher(root)
-    root.protocol("WM_DELETE_WINDOW", app.on_closing)
-    root.mainloop()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="PS2 Game Launcher")
+    parser.add_argument("--renderer", choices=["tk", "pygame"], help="interface (padrão: configuração)")
+    parser.add_argument("--windowed", action="store_true", help="abre a interface pygame em janela")
+    parser.add_argument("--record-trace", metavar="ARQUIVO",
+                        help="grava os eventos de entrada para reproduzir com input_trace.py")
+    args = parser.parse_args()
+
+    config = load_config()
+    if args.record_trace:
+        config["input_trace_path"] = args.record_trace
+    if (args.renderer or config["renderer"]) == "pygame":
+        import pygame_ui
+        pygame_ui.PygameLauncher(config, fullscreen=config["pygame_fullscreen"] and not args.windowed).run()
+        shutdown_logging()
+    else:
+        root = tk.Tk()
+        app = GameLauncher(root, config)
+        root.protocol("WM_DELETE_WINDOW", app.on_closing)
+        root.mainloop()
\ No newline at end of file
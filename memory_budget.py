@@ -0,0 +1,210 @@
+import os
+import gc
+import json
+import time
+import logging
+import tracemalloc
+
+import metrics
+
+log = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+
+def process_rss():
+    """Memória residente do processo em bytes (None se não houver como medir)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def available_memory():
+    """MemAvailable do sistema em bytes (Linux), ou None"""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def cache_usage(cache, size_of):
+    """Bytes e quantidade de itens de um cache {chave: valor}"""
+    return sum(size_of(value) for value in cache.values()), len(cache)
+
+
+def trim_lru(cache, limit, size_of):
+    """Remove os itens menos usados de um OrderedDict até caber em `limit` bytes"""
+    total = sum(size_of(value) for value in cache.values())
+    while cache and total > limit:
+        _, value = cache.popitem(last=False)
+        total -= size_of(value)
+
+
+def pil_image_bytes(image):
+    return image.width * image.height * len(image.getbands())
+
+
+def surface_bytes(surface):
+    if surface is None:
+        return 0
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+def sound_bytes(sound, mixer_init):
+    """Tamanho do buffer decodificado de um pygame.mixer.Sound"""
+    if not mixer_init:
+        return 0
+    frequency, sample_format, channels = mixer_init
+    return int(sound.get_length() * frequency) * channels * (abs(sample_format) // 8)
+
+
+def tracemalloc_top(limit):
+    """Maiores alocações Python por linha de código, se o tracemalloc estiver ativo"""
+    if not tracemalloc.is_tracing():
+        return []
+    statistics = tracemalloc.take_snapshot().statistics("lineno")[:limit]
+    return [{"where": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+             "bytes": stat.size,
+             "count": stat.count} for stat in statistics]
+
+
+class MemoryAccountant:
+    """Atribui a memória a cada subsistema e aplica os limites configurados
+
+    Cada pool registrado informa (bytes, itens) e pode ter uma função de
+    despejo `evict(limite_em_bytes)`, chamada quando passa do próprio
+    orçamento. Se o processo passar de `rss_budget_mb` ou o sistema ficar com
+    menos de `min_available_mb` livres, todos os pools despejáveis são
+    esvaziados antes que a máquina comece a usar swap.
+    """
+
+    def __init__(self, budgets_mb=None, rss_budget_mb=0, min_available_mb=0,
+                 report_path=None, tracemalloc_top=0):
+        self.budgets = {name: mb * MB for name, mb in (budgets_mb or {}).items()}
+        self.rss_budget = rss_budget_mb * MB
+        self.min_available = min_available_mb * MB
+        self.report_path = report_path
+        self.tracemalloc_limit = tracemalloc_top
+        self.pools = {}
+
+    def register(self, name, sizer, evict=None):
+        self.pools[name] = (sizer, evict)
+
+    def measure(self):
+        pools = {}
+        for name, (sizer, _) in self.pools.items():
+            try:
+                size, items = sizer()
+            except Exception as e:
+                log.error(f"Erro ao medir memória de {name}: {e}")
+                continue
+            pools[name] = {"bytes": size, "items": items, "budget": self.budgets.get(name)}
+            metrics.MEMORY_BYTES.set(size, pool=name)
+        return pools
+
+    def report(self):
+        rss = process_rss()
+        if rss is not None:
+            metrics.MEMORY_BYTES.set(rss, pool="rss")
+        return {
+            "timestamp": time.time(),
+            "pid": os.getpid(),
+            "rss": rss,
+            "available": available_memory(),
+            "rss_budget": self.rss_budget or None,
+            "pools": self.measure(),
+            "tracemalloc": tracemalloc_top(self.tracemalloc_limit)
+        }
+
+    def under_pressure(self, report):
+        if self.rss_budget and report["rss"] is not None and report["rss"] > self.rss_budget:
+            return f"RSS {report['rss'] / MB:.0f} MB acima do limite de {self.rss_budget / MB:.0f} MB"
+        if self.min_available and report["available"] is not None and report["available"] < self.min_available:
+            return f"apenas {report['available'] / MB:.0f} MB livres no sistema"
+        return None
+
+    def enforce(self, report):
+        """Despeja caches acima do orçamento; devolve os nomes dos pools despejados"""
+        evicted = []
+        pressure = self.under_pressure(report)
+        if pressure:
+            log.warning(f"Pressão de memória: {pressure}; esvaziando caches")
+        for name, (_, evict) in self.pools.items():
+            usage = report["pools"].get(name)
+            if evict is None or usage is None:
+                continue
+            limit = 0 if pressure else self.budgets.get(name)
+            if limit is not None and usage["bytes"] > limit:
+                evict(limit)
+                evicted.append(name)
+        if evicted:
+            gc.collect()
+            log.info(f"Caches despejados: {', '.join(evicted)}")
+        return evicted
+
+    def check(self):
+        """Mede, aplica os limites e grava o relatório para o toolstaff"""
+        report = self.report()
+        report["evicted"] = self.enforce(report)
+        if report["evicted"]:
+            report["pools"] = self.measure()
+        if self.report_path:
+            write_report(report, self.report_path)
+        return report
+
+
+def accountant_from_config(config):
+    if config["memory_tracemalloc"] and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    return MemoryAccountant(
+        budgets_mb=config["memory_budgets_mb"],
+        rss_budget_mb=config["memory_rss_budget_mb"],
+        min_available_mb=config["memory_min_available_mb"],
+        report_path=config["memory_report_path"],
+        tracemalloc_top=config["memory_tracemalloc_top"] if config["memory_tracemalloc"] else 0
+    )
+
+
+def write_report(report, path):
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+    except OSError as e:
+        log.error(f"Erro ao gravar relatório de memória em {path}: {e}")
+
+
+def load_report(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def format_report(report):
+    def mb(value):
+        return "?" if value is None else f"{value / MB:.1f} MB"
+
+    age = time.time() - report["timestamp"]
+    lines = [f"Launcher (PID {report['pid']}), relatório de {age:.0f}s atrás",
+             f"  RSS: {mb(report['rss'])}"
+             + (f" (limite {mb(report['rss_budget'])})" if report.get("rss_budget") else ""),
+             f"  Livre no sistema: {mb(report['available'])}"]
+    for name, usage in sorted(report["pools"].items(), key=lambda item: -item[1]["bytes"]):
+        budget = f" / {mb(usage['budget'])}" if usage.get("budget") else ""
+        lines.append(f"  {name:16} {mb(usage['bytes']):>10}{budget}  ({usage['items']} itens)")
+    if report.get("evicted"):
+        lines.append(f"  Despejados na última checagem: {', '.join(report['evicted'])}")
+    if report.get("tracemalloc"):
+        lines.append("  Maiores alocações (tracemalloc):")
+        for entry in report["tracemalloc"]:
+            lines.append(f"    {entry['bytes'] / 1024:10.1f} KB  {entry['count']:6}x  {entry['where']}")
+    return "\n".join(lines)
@@ -0,0 +1,114 @@
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import catalog
+
+log = logging.getLogger(__name__)
+
+HEADERS = {'User-Agent': 'GameLauncher'}
+RELEASES_API = "https://api.github.com/repos/{repo}/releases/latest"
+
+
+def format_size(size):
+    if size >= 1024 * 1024 * 1024:
+        return f"{size / (1024 * 1024 * 1024):.1f} GB"
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+def head_size(url, timeout):
+    """Tamanho do arquivo por HEAD (seguindo redirecionamentos); levanta se o link falhar"""
+    import requests
+
+    response = requests.head(url, headers=HEADERS, allow_redirects=True, timeout=timeout)
+    response.raise_for_status()
+    size = int(response.headers.get("content-length", 0))
+    return size or None
+
+
+def latest_version(repo, timeout):
+    """Tag do último release no GitHub, ou None se a API não responder"""
+    import requests
+
+    try:
+        response = requests.get(RELEASES_API.format(repo=repo), headers=HEADERS, timeout=timeout)
+        response.raise_for_status()
+        return response.json().get("tag_name")
+    except (requests.RequestException, ValueError) as e:
+        log.debug(f"Sem versão mais recente para {repo}: {e}")
+        return None
+
+
+def fetch_metadata(game, timeout=5, check_latest=False):
+    """Consulta disponibilidade e tamanho real do download (primeiro espelho que responder)"""
+    import requests
+
+    info = {"available": False, "size": None, "url": None, "error": None,
+            "latest_version": None, "checked_at": time.time()}
+    for url in catalog.download_urls(game):
+        try:
+            info["size"] = head_size(url, timeout)
+        except requests.RequestException as e:
+            info["error"] = str(e)
+            continue
+        info.update(available=True, url=url, error=None)
+        break
+    if check_latest and game.get("repo") and not game.get("download_url"):
+        info["latest_version"] = latest_version(game["repo"], timeout)
+    return info
+
+
+class MetadataCache:
+    """Busca metadados de download em segundo plano, com concorrência limitada e TTL
+
+    `request` devolve na hora o que estiver em cache e válido e agenda o
+    resto; `callback(game_id, info)` é chamada da thread de trabalho.
+    """
+
+    def __init__(self, ttl=900, max_workers=4, timeout=5, check_latest=False):
+        self.ttl = ttl
+        self.timeout = timeout
+        self.check_latest = check_latest
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="metadata")
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.in_flight = set()
+
+    def cached(self, game_id):
+        with self.lock:
+            info = self.entries.get(game_id)
+        if info and time.time() - info["checked_at"] < self.ttl:
+            return info
+        return None
+
+    def request(self, games, callback):
+        for game in games:
+            info = self.cached(game["id"])
+            if info is not None:
+                callback(game["id"], info)
+                continue
+            with self.lock:
+                if game["id"] in self.in_flight:
+                    continue
+                self.in_flight.add(game["id"])
+            self.pool.submit(self._fetch, game, callback)
+
+    def _fetch(self, game, callback):
+        try:
+            info = fetch_metadata(game, self.timeout, self.check_latest)
+        except Exception as e:
+            log.error(f"Erro ao consultar {game['title']}: {e}")
+            info = None
+        with self.lock:
+            self.in_flight.discard(game["id"])
+            if info is not None:
+                self.entries[game["id"]] = info
+        if info is None:
+            return
+        if not info["available"]:
+            log.warning(f"Link de download indisponível para {game['title']}: {info['error']}")
+        callback(game["id"], info)
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
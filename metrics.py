@@ -0,0 +1,269 @@
+import os
+import json
+import time
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler
+
+from range_server import BackgroundServer
+
+log = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+        self.values = {}
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: labels esperados {self.labelnames}, recebidos {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _format_labels(self, key, extra=None):
+        pairs = list(zip(self.labelnames, key))
+        if extra:
+            pairs.append(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self.lock:
+            items = sorted(self.values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{self._format_labels(key)} {value}")
+        return lines
+
+    def snapshot(self):
+        with self.lock:
+            return [{"labels": dict(zip(self.labelnames, key)), "value": value}
+                    for key, value in sorted(self.values.items())]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self.lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["counts"][i] += 1
+            state["sum"] += value
+            state["count"] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            items = sorted((key, dict(state, counts=list(state["counts"]))) for key, state in self.values.items())
+        for key, state in items:
+            for bound, count in zip(self.buckets, state["counts"]):
+                lines.append(f"{self.name}_bucket{self._format_labels(key, ('le', str(bound)))} {count}")
+            lines.append(f"{self.name}_bucket{self._format_labels(key, ('le', '+Inf'))} {state['count']}")
+            lines.append(f"{self.name}_sum{self._format_labels(key)} {state['sum']}")
+            lines.append(f"{self.name}_count{self._format_labels(key)} {state['count']}")
+        return lines
+
+    def snapshot(self):
+        with self.lock:
+            return [{"labels": dict(zip(self.labelnames, key)),
+                     "buckets": dict(zip(map(str, self.buckets), state["counts"])),
+                     "sum": state["sum"],
+                     "count": state["count"]}
+                    for key, state in sorted(self.values.items())]
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def register(self, metric):
+        with self.lock:
+            existing = self.metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self.metrics[metric.name] = metric
+            return metric
+
+    def render_prometheus(self):
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self):
+        return {
+            "timestamp": time.time(),
+            "metrics": {name: {"type": metric.kind, "help": metric.help, "values": metric.snapshot()}
+                        for name, metric in list(self.metrics.items())}
+        }
+
+
+REGISTRY = Registry()
+
+
+def counter(name, help_text, labelnames=()):
+    return REGISTRY.register(Counter(name, help_text, labelnames))
+
+
+def gauge(name, help_text, labelnames=()):
+    return REGISTRY.register(Gauge(name, help_text, labelnames))
+
+
+def histogram(name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+    return REGISTRY.register(Histogram(name, help_text, labelnames, buckets))
+
+
+# Métricas do launcher
+DOWNLOAD_BYTES = counter("launcher_download_bytes_total", "Bytes baixados")
+DOWNLOADS = counter("launcher_downloads_total", "Downloads finalizados por resultado", ["result"])
+DOWNLOAD_SPEED = gauge("launcher_download_speed_mbps", "Velocidade média do último download (MB/s)")
+DOWNLOAD_SOURCES = counter("launcher_download_sources_total", "Downloads concluídos por origem (peer ou origin)",
+                           ["source"])
+MIRROR_FAILOVERS = counter("launcher_mirror_failovers_total", "Trocas de espelho no meio de um download")
+DOWNLOAD_DURATION = histogram("launcher_download_duration_seconds", "Duração dos downloads concluídos")
+INPUT_EVENTS = counter("launcher_input_events_total", "Eventos de entrada processados", ["source", "action"])
+INPUT_HANDLING = histogram("launcher_input_handling_seconds", "Tempo para processar um evento de entrada",
+                           buckets=(0.001, 0.005, 0.01, 0.016, 0.033, 0.05, 0.1, 0.25, 0.5, 1))
+PREFETCH_BYTES = counter("launcher_prefetch_bytes_total", "Bytes pedidos ao SO para pré-carregamento")
+FRAME_TIME = histogram("launcher_frame_seconds", "Tempo de CPU de cada quadro da interface pygame",
+                       buckets=(0.001, 0.002, 0.004, 0.008, 0.0167, 0.033, 0.05, 0.1, 0.25))
+UI_STALLS = counter("launcher_ui_stalls_total", "Travamentos do mainloop acima do limite")
+GAME_LAUNCHES = counter("launcher_game_launches_total", "Jogos iniciados", ["game"])
+GAME_EXITS = counter("launcher_game_exits_total", "Jogos encerrados por resultado", ["game", "result"])
+GAME_READY = histogram("launcher_game_launch_to_ready_seconds", "Tempo entre iniciar o jogo e ele ficar pronto")
+GAMES_RUNNING = gauge("launcher_games_running", "Jogos em execução")
+MEMORY_BYTES = gauge("launcher_memory_bytes", "Memória atribuída a cada subsistema (rss = processo inteiro)",
+                     ["pool"])
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/metrics":
+            body = self.registry.render_prometheus().encode("utf-8")
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        elif path == "/metrics.json":
+            body = json.dumps(self.registry.to_dict(), ensure_ascii=False).encode("utf-8")
+            content_type = "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MetricsExporter:
+    """Expõe as métricas por HTTP (formato Prometheus) e grava um JSON periódico"""
+
+    def __init__(self, host="127.0.0.1", port=9464, json_path=None, json_interval=30.0, registry=REGISTRY):
+        self.host = host
+        self.port = port
+        self.json_path = json_path
+        self.json_interval = json_interval
+        self.registry = registry
+        self.server = None
+        self.stop_event = threading.Event()
+        self.dump_thread = None
+
+    def start(self):
+        if self.port is not None:
+            handler = type("BoundMetricsHandler", (MetricsHandler,), {"registry": self.registry})
+            try:
+                self.server = BackgroundServer(handler, self.host, self.port).start()
+                log.info(f"Métricas disponíveis em {self.server.base_url}/metrics")
+            except OSError as e:
+                log.error(f"Erro ao iniciar servidor de métricas na porta {self.port}: {e}")
+        if self.json_path:
+            self.dump_thread = threading.Thread(target=self._dump_loop, daemon=True)
+            self.dump_thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        if self.server is not None:
+            self.server.stop()
+            self.server = None
+        if self.json_path:
+            self.dump_json()
+
+    def dump_json(self):
+        try:
+            directory = os.path.dirname(self.json_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = self.json_path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.registry.to_dict(), f, ensure_ascii=False)
+            os.replace(temp_path, self.json_path)
+        except OSError as e:
+            log.error(f"Erro ao gravar métricas em {self.json_path}: {e}")
+
+    def _dump_loop(self):
+        while not self.stop_event.wait(self.json_interval):
+            self.dump_json()
+
+
+def exporter_from_config(config):
+    port = config["metrics_port"]
+    return MetricsExporter(
+        host=config["metrics_host"],
+        port=port if port else None,
+        json_path=config["metrics_json_path"],
+        json_interval=config["metrics_json_interval"]
+    )
@@ -0,0 +1,65 @@
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+log = logging.getLogger(__name__)
+
+# Bytes lidos de cada espelho para estimar a vazão
+PROBE_BYTES = 256 * 1024
+# Tamanho de referência usado para comparar latência e vazão em uma só nota
+REFERENCE_BYTES = 8 * 1024 * 1024
+
+
+def probe(url, timeout=3, headers=None):
+    """Mede a latência (até os cabeçalhos) e a vazão de um espelho com um Range curto"""
+    import requests
+
+    result = {"url": url, "ok": False, "latency": None, "throughput": None, "ranges": False, "error": None}
+    start = time.monotonic()
+    try:
+        probe_headers = dict(headers or {}, Range=f"bytes=0-{PROBE_BYTES - 1}")
+        with requests.get(url, headers=probe_headers, stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            latency = time.monotonic() - start
+            received = 0
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                received += len(chunk)
+                if received >= PROBE_BYTES or time.monotonic() - start > timeout:
+                    break
+        elapsed = time.monotonic() - start - latency
+        result.update(
+            ok=True,
+            latency=latency,
+            throughput=received / elapsed if elapsed > 0 and received else None,
+            ranges=response.status_code == 206
+        )
+    except requests.RequestException as e:
+        result["error"] = str(e)
+    return result
+
+
+def score(result):
+    """Tempo estimado (s) para baixar REFERENCE_BYTES do espelho; menor é melhor"""
+    if not result["ok"]:
+        return float("inf")
+    if not result["throughput"]:
+        return result["latency"]
+    return result["latency"] + REFERENCE_BYTES / result["throughput"]
+
+
+def rank_mirrors(urls, timeout=3, headers=None):
+    """Mede os espelhos em paralelo e devolve as URLs do mais rápido para o mais lento
+
+    Espelhos que falharam na medição ficam no fim da lista em vez de serem
+    descartados, pois a falha pode ter sido passageira.
+    """
+    with ThreadPoolExecutor(max_workers=len(urls)) as pool:
+        results = list(pool.map(lambda url: probe(url, timeout, headers), urls))
+    results.sort(key=score)
+    for result in results:
+        if result["ok"]:
+            speed = f"{result['throughput'] / (1024 * 1024):.1f} MB/s" if result["throughput"] else "?"
+            log.info(f"Espelho {result['url']}: {result['latency'] * 1000:.0f} ms, {speed}")
+        else:
+            log.warning(f"Espelho {result['url']} não respondeu: {result['error']}")
+    return [result["url"] for result in results]
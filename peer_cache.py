@@ -0,0 +1,116 @@
+import json
+import logging
+from urllib.parse import unquote
+
+import catalog
+import install_records
+import verify
+from range_server import RangeRequestHandler, BackgroundServer
+
+log = logging.getLogger(__name__)
+
+# URL de um artefato em um peer: /<id do jogo>/<versão>/<arquivo>
+INDEX_PATH = "/index.json"
+
+
+def servable_path(game_id, version, filename, records=None):
+    """Caminho local do artefato se ele puder ser servido a outros launchers
+
+    Só servimos arquivos da versão atual do catálogo cujo MD5 é conhecido
+    pelo catálogo (o mesmo que o cliente exige), que foram verificados com
+    esse hash e que não mudaram desde então.
+    """
+    game = catalog.find_game(catalog.GAMES, game_id)
+    if game is None or version != game["version"] or filename != game["file"]:
+        return None
+
+    if records is None:
+        records = install_records.load_records()
+    record = records.get(game_id)
+    if not record or record.get("version") != version or record.get("verify_status", "ok") != "ok":
+        return None
+
+    entry = record.get("files", {}).get(filename, {})
+    expected = catalog.known_md5(game)
+    if not expected or entry.get("md5") != expected:
+        return None
+
+    path = catalog.install_path(game)
+    try:
+        signature = verify.file_signature(path)
+    except FileNotFoundError:
+        return None
+    if any(entry.get(key) != value for key, value in signature.items()):
+        return None
+    return path
+
+
+def available_artifacts():
+    """Artefatos que este launcher pode servir, no formato do /index.json"""
+    records = install_records.load_records()
+    artifacts = []
+    for game in catalog.GAMES:
+        path = servable_path(game["id"], game["version"], game["file"], records)
+        if path is None:
+            continue
+        entry = records[game["id"]]["files"][game["file"]]
+        artifacts.append({
+            "id": game["id"],
+            "version": game["version"],
+            "file": game["file"],
+            "size": entry["size"],
+            "md5": entry["md5"],
+            "path": artifact_path(game)
+        })
+    return artifacts
+
+
+def artifact_path(game):
+    return f"/{game['id']}/{game['version']}/{game['file']}"
+
+
+def peer_urls(game, peers):
+    """URLs do artefato de um jogo em cada peer configurado"""
+    return [peer.rstrip("/") + artifact_path(game) for peer in peers]
+
+
+class PeerCacheHandler(RangeRequestHandler):
+    """Serve os artefatos verificados de INSTALL_DIR, com suporte a Range"""
+
+    def resolve_path(self, url_path):
+        parts = [unquote(part) for part in url_path.strip("/").split("/")]
+        if len(parts) != 3:
+            return None
+        path = servable_path(*parts)
+        if path is not None:
+            log.info(f"Servindo {url_path} para {self.client_address[0]}")
+        return path
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != INDEX_PATH:
+            super().do_GET()
+            return
+        body = json.dumps(available_artifacts(), ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class PeerCacheServer(BackgroundServer):
+    def __init__(self, host="0.0.0.0", port=8765):
+        super().__init__(PeerCacheHandler, host, port)
+
+
+def server_from_config(config):
+    """Inicia o cache para a rede local se estiver habilitado na configuração"""
+    if not config["peer_cache_serve"]:
+        return None
+    try:
+        server = PeerCacheServer(config["peer_cache_host"], config["peer_cache_port"]).start()
+    except OSError as e:
+        log.error(f"Erro ao iniciar cache para a rede local na porta {config['peer_cache_port']}: {e}")
+        return None
+    log.info(f"Cache para a rede local em {server.base_url}")
+    return server
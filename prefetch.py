@@ -0,0 +1,129 @@
+import os
+import logging
+import threading
+
+import catalog
+import install_records
+import metrics
+import process_priority
+import verify
+
+log = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+# Tamanho de cada pedido ao SO; entre eles o trabalho pode ser cancelado
+SLICE_SIZE = 8 * MB
+
+
+def prefetch_paths(game, record):
+    """Arquivos a aquecer: o executável primeiro e depois os demais da instalação"""
+    executable = catalog.install_path(game)
+    paths = [executable]
+    for relpath in verify.game_files(game, record):
+        path = os.path.join(catalog.INSTALL_DIR, relpath)
+        if os.path.normpath(path) != os.path.normpath(executable):
+            paths.append(path)
+    return paths
+
+
+def warm_slice(f, offset, length, buffer):
+    """Traz um trecho do arquivo para o page cache do SO
+
+    A leitura é síncrona de propósito: posix_fadvise(WILLNEED) só agenda a
+    leitura no kernel, e aí nem o limite de bytes nem o cancelamento valeriam
+    para o disco de verdade.
+    """
+    f.seek(offset)
+    view = memoryview(buffer)
+    remaining = length
+    while remaining > 0:
+        read = f.readinto(view[:min(len(buffer), remaining)])
+        if not read:
+            break
+        remaining -= read
+
+
+class Prefetcher:
+    """Aquece o page cache com os arquivos do jogo destacado, em uma thread ociosa
+
+    Só o pedido mais recente é atendido: destacar outro jogo interrompe o
+    anterior. O total de bytes aquecidos na sessão é limitado por `max_bytes`
+    e cada arquivo é aquecido uma única vez (enquanto não mudar).
+    """
+
+    def __init__(self, max_bytes=512 * MB):
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self.warmed = set()
+        self.pending = None
+        self.generation = 0
+        self.condition = threading.Condition()
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def request(self, game):
+        with self.condition:
+            self.generation += 1
+            self.pending = game
+            self.condition.notify()
+
+    def cancel(self):
+        with self.condition:
+            self.generation += 1
+            self.pending = None
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.generation += 1
+            self.condition.notify()
+
+    def _run(self):
+        process_priority.lower_current_thread()
+        while True:
+            with self.condition:
+                while self.running and self.pending is None:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                game, generation = self.pending, self.generation
+                self.pending = None
+            try:
+                self._prefetch(game, generation)
+            except OSError as e:
+                log.error(f"Erro ao pré-carregar {game['title']}: {e}")
+
+    def _cancelled(self, generation):
+        return generation != self.generation
+
+    def _prefetch(self, game, generation):
+        record = install_records.load_records().get(game["id"])
+        buffer = bytearray(MB)
+        total = 0
+        for path in prefetch_paths(game, record):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            key = (path, st.st_size, st.st_mtime_ns)
+            if key in self.warmed:
+                continue
+            length = min(st.st_size, self.max_bytes - self.used_bytes)
+            if length <= 0:
+                log.info("Limite de pré-carregamento atingido")
+                return
+
+            with open(path, "rb", buffering=0) as f:
+                for offset in range(0, length, SLICE_SIZE):
+                    if self._cancelled(generation):
+                        return
+                    size = min(SLICE_SIZE, length - offset)
+                    warm_slice(f, offset, size, buffer)
+                    self.used_bytes += size
+                    total += size
+                    metrics.PREFETCH_BYTES.inc(size)
+            if length == st.st_size:
+                self.warmed.add(key)
+        if total:
+            log.info(f"{game['title']}: {total / MB:.1f} MB pré-carregados no cache do sistema")
@@ -0,0 +1,109 @@
+import os
+import sys
+import logging
+
+# Constantes da API do Windows
+WINDOWS_IDLE_PRIORITY = 0x40
+WINDOWS_THREAD_MODE_BACKGROUND_BEGIN = 0x00010000
+
+log = logging.getLogger(__name__)
+
+
+def lower_priority():
+    """Coloca o launcher em prioridade ociosa
+
+    Devolve o estado anterior para `restore_priority`, ou None quando não é
+    possível baixar a prioridade de forma reversível (no Linux, sair de
+    SCHED_IDLE exige root ou RLIMIT_NICE suficiente).
+    """
+    try:
+        if sys.platform == "win32":
+            return _lower_windows()
+        if hasattr(os, "SCHED_IDLE") and os.path.isdir("/proc/self/task"):
+            return _lower_linux()
+    except OSError as e:
+        log.error(f"Erro ao reduzir prioridade do launcher: {e}")
+    return None
+
+
+def restore_priority(state):
+    """Restaura a prioridade salva por `lower_priority`"""
+    if state is None:
+        return
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetPriorityClass(kernel32.GetCurrentProcess(), state)
+        else:
+            # Só as threads alteradas por lower_priority; as que já eram
+            # ociosas (ex.: pré-carregamento) continuam assim
+            for tid, (policy, priority) in state.items():
+                try:
+                    os.sched_setscheduler(tid, policy, os.sched_param(priority))
+                except ProcessLookupError:
+                    pass
+    except OSError as e:
+        log.error(f"Erro ao restaurar prioridade do launcher: {e}")
+
+
+def _lower_windows():
+    import ctypes
+    kernel32 = ctypes.windll.kernel32
+    handle = kernel32.GetCurrentProcess()
+    previous = kernel32.GetPriorityClass(handle)
+    if not previous or not kernel32.SetPriorityClass(handle, WINDOWS_IDLE_PRIORITY):
+        return None
+    return previous
+
+
+def _can_restore_linux():
+    if os.geteuid() == 0:
+        return True
+    import resource
+    soft, _ = resource.getrlimit(resource.RLIMIT_NICE)
+    nice = os.getpriority(os.PRIO_PROCESS, 0)
+    return soft == resource.RLIM_INFINITY or 20 - nice <= soft
+
+
+def _thread_ids():
+    return [int(tid) for tid in os.listdir("/proc/self/task")]
+
+
+def _lower_linux():
+    if not _can_restore_linux():
+        return None
+    # No Linux a política de escalonamento é por thread: guarda a de cada
+    # thread alterada para devolver exatamente essas
+    changed = {}
+    for tid in _thread_ids():
+        try:
+            policy = os.sched_getscheduler(tid)
+            if policy == os.SCHED_IDLE:
+                continue
+            priority = os.sched_getparam(tid).sched_priority
+            os.sched_setscheduler(tid, os.SCHED_IDLE, os.sched_param(0))
+        except ProcessLookupError:
+            continue
+        changed[tid] = (policy, priority)
+    return changed
+
+
+def lower_current_thread():
+    """Coloca só a thread atual em prioridade ociosa (CPU e, no Windows, disco)
+
+    Ao contrário de `lower_priority` não há volta: serve para threads de
+    trabalho em segundo plano que vivem com a prioridade baixa.
+    """
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            # THREAD_MODE_BACKGROUND_BEGIN também reduz a prioridade de E/S
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), WINDOWS_THREAD_MODE_BACKGROUND_BEGIN)
+        elif hasattr(os, "SCHED_IDLE"):
+            os.sched_setscheduler(0, os.SCHED_IDLE, os.sched_param(0))
+        else:
+            os.nice(19)
+    except OSError as e:
+        log.error(f"Erro ao reduzir prioridade da thread: {e}")
@@ -0,0 +1,223 @@
+import os
+import logging
+import select
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+
+try:
+    CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+    PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    CLOCK_TICKS = 100
+    PAGE_SIZE = 4096
+
+log = logging.getLogger(__name__)
+
+
+def read_proc_stat(pid):
+    """Lê tempo de CPU (segundos) e RSS (bytes) de /proc/<pid>/stat, ou None fora do Linux"""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            data = f.read().decode("ascii", "replace")
+    except OSError:
+        return None
+    # O nome do processo pode conter espaços, então os campos começam após o último ')'
+    fields = data[data.rfind(")") + 2:].split()
+    cpu_seconds = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+    rss_bytes = int(fields[21]) * PAGE_SIZE
+    return cpu_seconds, rss_bytes
+
+
+class SupervisedProcess:
+    """Estado e métricas de um processo de jogo acompanhado pelo supervisor"""
+
+    def __init__(self, name, popen, game_id=None):
+        self.name = name
+        # Rótulo das métricas; o nome é o título exibido ao usuário
+        self.game_id = game_id or name
+        self.popen = popen
+        self.pid = popen.pid
+        self.started_at = time.monotonic()
+        self.ready_at = None
+        self.ended_at = None
+        self.exit_code = None
+        self.stop_requested = False
+        self.killed = False
+        self.cpu_percent = 0.0
+        self.rss = 0
+        self.peak_rss = 0
+        self.samples = deque(maxlen=300)
+
+    @property
+    def running(self):
+        return self.ended_at is None
+
+    @property
+    def crashed(self):
+        """Saiu com erro sem que o launcher tenha pedido o encerramento"""
+        return self.exit_code not in (None, 0) and not self.stop_requested
+
+    @property
+    def launch_to_ready(self):
+        if self.ready_at is None:
+            return None
+        return self.ready_at - self.started_at
+
+    def stats(self):
+        end = self.ended_at if self.ended_at is not None else time.monotonic()
+        return {
+            "name": self.name,
+            "game_id": self.game_id,
+            "pid": self.pid,
+            "running": self.running,
+            "uptime": round(end - self.started_at, 2),
+            "launch_to_ready": None if self.launch_to_ready is None else round(self.launch_to_ready, 2),
+            "cpu_percent": round(self.cpu_percent, 1),
+            "rss_mb": round(self.rss / (1024 * 1024), 1),
+            "peak_rss_mb": round(self.peak_rss / (1024 * 1024), 1),
+            "exit_code": self.exit_code,
+            "crashed": self.crashed,
+            "killed": self.killed
+        }
+
+
+class ProcessSupervisor:
+    """Lança processos de jogo e acompanha execução, consumo e encerramento
+
+    Cada processo tem uma thread que espera pela saída (via pidfd quando
+    disponível) e amostra CPU/RSS de /proc a cada `sample_interval`. O processo
+    é considerado pronto quando o RSS para de crescer entre duas amostras, o
+    que indica que o carregamento inicial terminou.
+    """
+
+    def __init__(self, sample_interval=1.0, ready_growth=0.02, on_ready=None, on_exit=None):
+        self.sample_interval = sample_interval
+        self.ready_growth = ready_growth
+        self.on_ready = on_ready
+        self.on_exit = on_exit
+        self.processes = []
+        self.lock = threading.Lock()
+
+    def launch(self, args, name=None, game_id=None, **popen_kwargs):
+        """Inicia o processo e a thread que o acompanha"""
+        popen = subprocess.Popen(args, **popen_kwargs)
+        proc = SupervisedProcess(name or os.path.basename(args[0]), popen, game_id)
+        with self.lock:
+            self.processes.append(proc)
+        threading.Thread(target=self._watch, args=(proc,), daemon=True).start()
+        return proc
+
+    def terminate(self, proc, timeout=5.0, wait=False):
+        """Pede o encerramento e escala para kill se o processo não sair a tempo"""
+        proc.stop_requested = True
+        if wait:
+            self._escalate(proc, timeout)
+        else:
+            threading.Thread(target=self._escalate, args=(proc, timeout), daemon=True).start()
+
+    def shutdown(self, timeout=3.0):
+        """Encerra todos os processos ainda em execução"""
+        with self.lock:
+            running = [proc for proc in self.processes if proc.running]
+        for proc in running:
+            proc.stop_requested = True
+            try:
+                proc.popen.terminate()
+            except OSError:
+                pass
+        deadline = time.monotonic() + timeout
+        for proc in running:
+            self._escalate(proc, max(0.0, deadline - time.monotonic()))
+
+    def _escalate(self, proc, timeout):
+        try:
+            proc.popen.terminate()
+            proc.popen.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            log.warning(f"{proc.name} não respondeu ao terminate, forçando kill")
+            proc.killed = True
+            proc.popen.kill()
+            proc.popen.wait()
+        except OSError:
+            pass
+
+    def _open_pidfd(self, pid):
+        if not hasattr(os, "pidfd_open"):
+            return None
+        try:
+            return os.pidfd_open(pid)
+        except OSError:
+            return None
+
+    def _watch(self, proc):
+        """Espera a saída do processo enquanto coleta amostras de consumo"""
+        pidfd = self._open_pidfd(proc.pid)
+        poller = None
+        if pidfd is not None:
+            poller = select.poll()
+            poller.register(pidfd, select.POLLIN)
+
+        last_sample = None
+        try:
+            while True:
+                if poller is not None:
+                    exited = bool(poller.poll(self.sample_interval * 1000))
+                else:
+                    try:
+                        proc.popen.wait(timeout=self.sample_interval)
+                        exited = True
+                    except subprocess.TimeoutExpired:
+                        exited = False
+
+                if exited:
+                    break
+                last_sample = self._sample(proc, last_sample)
+        finally:
+            if pidfd is not None:
+                os.close(pidfd)
+
+        proc.exit_code = proc.popen.wait()
+        proc.ended_at = time.monotonic()
+        with self.lock:
+            self.processes.remove(proc)
+        self._report_exit(proc)
+        if self.on_exit:
+            self.on_exit(proc)
+
+    def _sample(self, proc, last_sample):
+        """Atualiza CPU, RSS e a detecção de prontidão"""
+        now = time.monotonic()
+        stat = read_proc_stat(proc.pid)
+        if stat is None:
+            return last_sample
+
+        cpu_seconds, rss = stat
+        if last_sample is not None:
+            last_time, last_cpu, last_rss = last_sample
+            elapsed = now - last_time
+            if elapsed > 0:
+                proc.cpu_percent = (cpu_seconds - last_cpu) / elapsed * 100
+            if proc.ready_at is None and last_rss > 0 and rss <= last_rss * (1 + self.ready_growth):
+                proc.ready_at = now
+                if self.on_ready:
+                    self.on_ready(proc)
+
+        proc.rss = rss
+        proc.peak_rss = max(proc.peak_rss, rss)
+        proc.samples.append((now, proc.cpu_percent, rss))
+        return now, cpu_seconds, rss
+
+    def _report_exit(self, proc):
+        stats = proc.stats()
+        if proc.exit_code is not None and proc.exit_code < 0:
+            try:
+                reason = f"sinal {signal.Signals(-proc.exit_code).name}"
+            except ValueError:
+                reason = f"sinal {-proc.exit_code}"
+        else:
+            reason = f"código {proc.exit_code}"
+        log.info(f"{proc.name} finalizado ({reason}) | duração {stats['uptime']}s | "
+                 f"pronto em {stats['launch_to_ready']}s | pico RAM {stats['peak_rss_mb']} MB")
@@ -0,0 +1,765 @@
+"""Interface alternativa em tela cheia desenhada direto em uma superfície do pygame.
+
+Logos, ícones e capas são convertidos uma única vez para o formato da tela
+(convert_alpha) e cada card é pré-renderizado em uma superfície própria. A
+cada quadro só os retângulos que mudaram são redesenhados e enviados para a
+tela, com limite de quadros por segundo e vsync quando o driver permite.
+Selecione com `python main.py --renderer pygame` ou "renderer" na configuração.
+"""
+import os
+import gc
+import time
+import queue
+import logging
+import threading
+from collections import OrderedDict
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame
+
+import catalog
+import input_trace
+import installer
+import metadata
+import memory_budget
+import metrics
+import peer_cache
+import prefetch
+import process_priority
+import storage
+from process_supervisor import ProcessSupervisor
+
+log = logging.getLogger(__name__)
+
+COLORS = {
+    "bg": pygame.Color("#1a1a1a"),
+    "header": pygame.Color("#2a2a2a"),
+    "card": pygame.Color("#252525"),
+    "text": pygame.Color("#ffffff"),
+    "accent": pygame.Color("#4CAF50"),
+    "secondary": pygame.Color("#3498db"),
+    "highlight": pygame.Color("#FF5722"),
+    "disabled": pygame.Color("#777777")
+}
+
+MENU_OPTIONS = ["Jogos", "Extras", "Configurações", "Sair"]
+LOGO_SIZE = (300, 150)
+MENU_ICON_SIZE = (30, 30)
+MENU_ROW_HEIGHT = 50
+COVER_SIZE = (120, 120)
+CARD_HEIGHT = 150
+CARD_GAP = 20
+CARD_MARGIN = 40
+HEADER_HEIGHT = 80
+HINT = "Controle PS2: ▲/▼ Navegar  x Confirmar  ○ Voltar"
+
+# Mesmo mapeamento de botões do controle PS2 usado na interface Tk
+BUTTON_MAP = {'x': 0, 'circle': 1, 'square': 2, 'triangle': 3}
+KEY_ACTIONS = {
+    pygame.K_UP: "up",
+    pygame.K_DOWN: "down",
+    pygame.K_RETURN: "confirm",
+    pygame.K_KP_ENTER: "confirm",
+    pygame.K_ESCAPE: "back",
+    pygame.K_BACKSPACE: "back"
+}
+
+
+def menu_icon_path(option):
+    icon_name = option.lower().replace("ç", "c").replace("õ", "o") + "_icon.png"
+    return os.path.join("assets", "icons", icon_name)
+
+
+class SurfaceCache:
+    """Imagens já redimensionadas e convertidas para o formato da tela"""
+
+    def __init__(self):
+        self.surfaces = OrderedDict()
+
+    def get(self, path, size):
+        """Devolve a imagem pronta, ou None se ela não puder ser carregada"""
+        key = (path, size)
+        if key in self.surfaces:
+            self.surfaces.move_to_end(key)
+        else:
+            try:
+                image = pygame.image.load(path).convert_alpha()
+                self.surfaces[key] = pygame.transform.smoothscale(image, size)
+            except (pygame.error, FileNotFoundError) as e:
+                log.error(f"Erro ao carregar imagem {path}: {e}")
+                self.surfaces[key] = None
+        return self.surfaces[key]
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+class PygameLauncher:
+    def __init__(self, config, fullscreen=True, size=(1280, 720)):
+        self.config = config
+        self.fullscreen = fullscreen
+        self.window_size = size
+        self.running = True
+        self.screen_name = "main_menu"
+        self.selected_index = 0
+        self.selected_card_index = 0
+        self.scroll = 0
+        self.games = catalog.load_catalog()
+        self.availability = {}
+        self.images = SurfaceCache()
+        self.card_surfaces = OrderedDict()
+        self.text_cache = OrderedDict()
+        self.dirty = []
+        self.calls = queue.SimpleQueue()
+        self.message = None
+        self.message_until = 0
+        self.sounds = OrderedDict()
+        self.joystick = None
+        self.suspended = False
+        self.priority_state = None
+        self.game_process = None
+        self.download = None
+        self.dwell_deadline = None
+        self.status_deadline = 0
+        self.trace_recorder = None
+        if config["input_trace_path"]:
+            self.trace_recorder = input_trace.TraceRecorder(config["input_trace_path"])
+
+        self.supervisor = ProcessSupervisor(on_ready=self.on_game_ready, on_exit=self.on_game_exit)
+        self.metadata = metadata.MetadataCache(ttl=config["metadata_ttl"],
+                                               max_workers=config["metadata_workers"],
+                                               timeout=config["metadata_timeout"],
+                                               check_latest=config["metadata_check_latest"])
+        self.prefetcher = None
+        if config["prefetch_enabled"]:
+            self.prefetcher = prefetch.Prefetcher(config["prefetch_max_mb"] * 1024 * 1024)
+
+        pygame.init()
+        self.setup_display()
+        self.fonts = {
+            "title": pygame.font.Font(None, 48),
+            "option": pygame.font.Font(None, 40),
+            "option_bold": pygame.font.Font(None, 46),
+            "card_title": pygame.font.Font(None, 36),
+            "text": pygame.font.Font(None, 26),
+            "small": pygame.font.Font(None, 22)
+        }
+        self.fonts["option_bold"].set_bold(True)
+        self.fonts["card_title"].set_bold(True)
+        self.load_sounds()
+        self.setup_joystick()
+
+        self.metrics_exporter = metrics.exporter_from_config(config).start()
+        self.peer_cache_server = peer_cache.server_from_config(config)
+        self.memory = memory_budget.accountant_from_config(config)
+        self.setup_memory_accounting()
+        self.memory_deadline = time.monotonic() + config["memory_check_interval"]
+        self.invalidate()
+
+    # Tela e recursos
+
+    def setup_display(self):
+        """Abre a tela; com vsync o SDL usa um renderer acelerado (SCALED)"""
+        flags = pygame.FULLSCREEN if self.fullscreen else 0
+        size = (0, 0) if self.fullscreen else self.window_size
+        self.screen = None
+        if self.config["pygame_vsync"]:
+            try:
+                # SCALED desenha na resolução lógica e a GPU escala para a tela
+                self.screen = pygame.display.set_mode(self.window_size, flags | pygame.SCALED, vsync=1)
+            except pygame.error as e:
+                log.warning(f"vsync indisponível: {e}")
+        if self.screen is None:
+            self.screen = pygame.display.set_mode(size, flags)
+        pygame.display.set_caption("PS2 Game Launcher")
+        pygame.mouse.set_visible(False)
+        self.width, self.height = self.screen.get_size()
+        try:
+            pygame.display.set_icon(pygame.image.load(catalog.ICONS[0]))
+        except (pygame.error, FileNotFoundError) as e:
+            log.error(f"Erro ao carregar ícone: {e}")
+
+    def load_sounds(self):
+        if not self.config["audio_enabled"]:
+            return
+        try:
+            pygame.mixer.init()
+        except pygame.error as e:
+            log.error(f"Erro ao iniciar o áudio: {e}")
+            return
+        for name in catalog.SOUNDS:
+            self.load_sound(name)
+
+    def load_sound(self, name):
+        path = catalog.SOUNDS[name]
+        try:
+            sound = pygame.mixer.Sound(path)
+        except (pygame.error, FileNotFoundError) as e:
+            log.error(f"Erro ao carregar som {path}: {e}")
+            return None
+        self.sounds[name] = sound
+        return sound
+
+    def setup_memory_accounting(self):
+        """Registra as superfícies em cache e os sons na contabilidade de memória"""
+        def card_bytes(entry):
+            return memory_budget.surface_bytes(entry[1])
+
+        def sound_bytes(sound):
+            return memory_budget.sound_bytes(sound, pygame.mixer.get_init())
+
+        def register_cache(name, cache, size_of):
+            self.memory.register(name, lambda: memory_budget.cache_usage(cache, size_of),
+                                 lambda limit: memory_budget.trim_lru(cache, limit, size_of))
+
+        register_cache("image_cache", self.images.surfaces, memory_budget.surface_bytes)
+        register_cache("card_surfaces", self.card_surfaces, card_bytes)
+        register_cache("text_cache", self.text_cache, memory_budget.surface_bytes)
+        register_cache("sounds", self.sounds, sound_bytes)
+        self.memory.register("downloads", installer.buffer_usage)
+
+    def check_memory(self):
+        if time.monotonic() < self.memory_deadline:
+            return
+        self.memory_deadline = time.monotonic() + self.config["memory_check_interval"]
+        self.memory.check()
+
+    def play_sound(self, name):
+        """Toca um som, recarregando-o se tiver sido despejado pela contabilidade de memória"""
+        sound = self.sounds.get(name)
+        if sound is not None:
+            self.sounds.move_to_end(name)
+        elif name in catalog.SOUNDS and pygame.mixer.get_init():
+            sound = self.load_sound(name)
+        if sound is not None:
+            sound.play()
+
+    def setup_joystick(self):
+        if pygame.joystick.get_count() > 0:
+            self.joystick = pygame.joystick.Joystick(0)
+            log.info(f"Controle conectado: {self.joystick.get_name()}")
+        else:
+            self.joystick = None
+            log.warning("Conecte um controle PS2")
+
+    def text(self, text, font, color):
+        """Superfície de texto renderizada uma única vez"""
+        key = (text, font, tuple(color))
+        surface = self.text_cache.get(key)
+        if surface is None:
+            surface = self.fonts[font].render(text, True, color)
+            self.text_cache[key] = surface
+        else:
+            self.text_cache.move_to_end(key)
+        return surface
+
+    # Redesenho por retângulos
+
+    def invalidate(self, rect=None):
+        self.dirty.append(pygame.Rect(rect) if rect is not None else self.screen.get_rect())
+
+    def render(self):
+        """Redesenha só as áreas inválidas e envia apenas elas para a tela"""
+        if not self.dirty:
+            return
+        rects = self.dirty
+        self.dirty = []
+        screen_rect = self.screen.get_rect()
+        if any(rect.contains(screen_rect) for rect in rects):
+            rects = [screen_rect]
+        for rect in rects:
+            self.screen.set_clip(rect)
+            self.draw_screen()
+        self.screen.set_clip(None)
+        pygame.display.update(rects)
+
+    def draw_screen(self):
+        self.screen.fill(COLORS["bg"])
+        if self.screen_name == "main_menu":
+            self.draw_main_menu()
+        elif self.screen_name == "games":
+            self.draw_games()
+        elif self.screen_name == "in_game":
+            self.draw_in_game()
+        elif self.screen_name == "download":
+            self.draw_download()
+        if self.message:
+            self.draw_message()
+
+    def blit_centered(self, surface, center):
+        rect = surface.get_rect(center=center)
+        self.screen.blit(surface, rect)
+        return rect
+
+    # Menu principal
+
+    def menu_row_rect(self, index):
+        top = 40 + LOGO_SIZE[1] + 40
+        return pygame.Rect(0, top + index * MENU_ROW_HEIGHT, self.width, MENU_ROW_HEIGHT)
+
+    def draw_main_menu(self):
+        logo = self.images.get(os.path.join("assets", "icons", "opl_logo.png"), LOGO_SIZE)
+        if logo is not None:
+            self.blit_centered(logo, (self.width // 2, 40 + LOGO_SIZE[1] // 2))
+        else:
+            self.blit_centered(self.text("GAME LAUNCHER", "title", COLORS["accent"]), (self.width // 2, 100))
+
+        for i, option in enumerate(MENU_OPTIONS):
+            row = self.menu_row_rect(i)
+            selected = i == self.selected_index
+            label = self.text(option, "option_bold" if selected else "option",
+                              COLORS["text"] if selected else COLORS["disabled"])
+            icon = self.images.get(menu_icon_path(option), MENU_ICON_SIZE)
+            width = label.get_width() + MENU_ICON_SIZE[0] + 20
+            left = self.width // 2 - width // 2
+            if icon is not None:
+                self.screen.blit(icon, icon.get_rect(midleft=(left, row.centery)))
+            elif selected:
+                self.screen.blit(self.text(">", "option", COLORS["accent"]), (left, row.top + 10))
+            self.screen.blit(label, label.get_rect(midleft=(left + MENU_ICON_SIZE[0] + 20, row.centery)))
+
+        self.blit_centered(self.text(HINT, "small", COLORS["disabled"]), (self.width // 2, self.height - 30))
+
+    # Lista de jogos
+
+    def list_viewport(self):
+        return pygame.Rect(0, HEADER_HEIGHT + CARD_GAP, self.width, self.height - HEADER_HEIGHT - CARD_GAP)
+
+    def card_rect(self, index):
+        viewport = self.list_viewport()
+        top = viewport.top + index * (CARD_HEIGHT + CARD_GAP) - self.scroll
+        return pygame.Rect(CARD_MARGIN, top, self.width - 2 * CARD_MARGIN, CARD_HEIGHT)
+
+    def visible_cards(self):
+        viewport = self.list_viewport()
+        step = CARD_HEIGHT + CARD_GAP
+        first = max(0, self.scroll // step)
+        last = min(len(self.games), (self.scroll + viewport.height) // step + 1)
+        return range(first, last)
+
+    def card_surface(self, game):
+        """Card pré-renderizado; refeito só quando o estado do jogo muda"""
+        available = self.availability.get(game["id"], True)
+        key = (game["id"], game["installed"], game["size"], game["version"], available, self.width)
+        surface = self.card_surfaces.get(game["id"])
+        if surface is not None and surface[0] == key:
+            self.card_surfaces.move_to_end(game["id"])
+            return surface[1]
+
+        width = self.width - 2 * CARD_MARGIN
+        card = pygame.Surface((width, CARD_HEIGHT)).convert()
+        card.fill(COLORS["card"])
+        cover = self.images.get(game["cover"], COVER_SIZE)
+        if cover is not None:
+            card.blit(cover, (20, (CARD_HEIGHT - COVER_SIZE[1]) // 2))
+        else:
+            card.blit(self.text("Sem Imagem", "small", COLORS["disabled"]), (30, CARD_HEIGHT // 2 - 8))
+
+        left = COVER_SIZE[0] + 50
+        card.blit(self.text(game["title"], "card_title", COLORS["text"]), (left, 25))
+        details = f"Versão: {game['version']} | Tamanho: {game['size']}"
+        if not available:
+            details += " | Download indisponível"
+        card.blit(self.text(details, "text", COLORS["highlight"] if not available else COLORS["disabled"]),
+                  (left, 65))
+
+        if game["installed"]:
+            label, color = "JOGAR", COLORS["accent"]
+        elif available:
+            label, color = "INSTALAR", COLORS["secondary"]
+        else:
+            label, color = "INDISPONÍVEL", COLORS["disabled"]
+        text = self.text(label, "card_title", COLORS["text"])
+        button = text.get_rect().inflate(40, 20)
+        button.bottomright = (width - 20, CARD_HEIGHT - 20)
+        pygame.draw.rect(card, color, button)
+        card.blit(text, text.get_rect(center=button.center))
+
+        self.card_surfaces[game["id"]] = (key, card)
+        return card
+
+    def draw_games(self):
+        header = pygame.Rect(0, 0, self.width, HEADER_HEIGHT)
+        pygame.draw.rect(self.screen, COLORS["header"], header)
+        self.screen.blit(self.text("Jogos", "title", COLORS["text"]), (CARD_MARGIN, 22))
+        back = self.text("○ Voltar", "text", COLORS["disabled"])
+        self.screen.blit(back, back.get_rect(midright=(self.width - CARD_MARGIN, header.centery)))
+
+        viewport = self.list_viewport()
+        clip = self.screen.get_clip()
+        self.screen.set_clip(clip.clip(viewport))
+        for i in self.visible_cards():
+            rect = self.card_rect(i)
+            self.screen.blit(self.card_surface(self.games[i]), rect)
+            if i == self.selected_card_index:
+                pygame.draw.rect(self.screen, COLORS["highlight"], rect.inflate(4, 4), 2)
+        self.screen.set_clip(clip)
+
+    def ensure_selected_visible(self):
+        """Ajusta a rolagem para o card selecionado; devolve True se ela mudou"""
+        viewport = self.list_viewport()
+        step = CARD_HEIGHT + CARD_GAP
+        top = self.selected_card_index * step
+        previous = self.scroll
+        if top < self.scroll:
+            self.scroll = top
+        elif top + CARD_HEIGHT > self.scroll + viewport.height:
+            self.scroll = top + CARD_HEIGHT - viewport.height
+        return self.scroll != previous
+
+    def open_games(self):
+        self.screen_name = "games"
+        self.selected_card_index = 0
+        self.scroll = 0
+        self.invalidate()
+        self.schedule_prefetch()
+        self.metadata.request([game for game in self.games if not game["installed"]],
+                              lambda game_id, info: self.call_soon(self.apply_metadata, game_id, info))
+
+    def apply_metadata(self, game_id, info):
+        game = catalog.find_game(self.games, game_id)
+        if game is None:
+            return
+        if info["size"]:
+            game["size"] = metadata.format_size(info["size"])
+        self.availability[game_id] = info["available"]
+        if self.screen_name == "games":
+            index = self.games.index(game)
+            if index in self.visible_cards():
+                self.invalidate(self.card_rect(index).inflate(6, 6))
+
+    def schedule_prefetch(self):
+        if self.prefetcher is not None:
+            self.prefetcher.cancel()
+            self.dwell_deadline = time.monotonic() + self.config["prefetch_dwell_ms"] / 1000
+
+    def check_prefetch(self):
+        if self.dwell_deadline is None or time.monotonic() < self.dwell_deadline:
+            return
+        self.dwell_deadline = None
+        if self.screen_name == "games" and self.selected_card_index < len(self.games):
+            game = self.games[self.selected_card_index]
+            if game["installed"]:
+                self.prefetcher.request(game)
+
+    # Jogo em execução
+
+    def status_rect(self):
+        return pygame.Rect(0, self.height // 2 - 25, self.width, 50)
+
+    def check_game_status(self):
+        """Redesenha o consumo do jogo uma vez por segundo"""
+        if self.screen_name != "in_game" or time.monotonic() < self.status_deadline:
+            return
+        self.status_deadline = time.monotonic() + 1
+        self.invalidate(self.status_rect())
+
+    def draw_in_game(self):
+        proc = self.game_process
+        if proc is None:
+            return
+        if proc.running:
+            stats = proc.stats()
+            state = "Em execução" if proc.ready_at is not None else "Carregando"
+            status = f"{proc.name}: {state} | CPU {stats['cpu_percent']:.0f}% | RAM {stats['rss_mb']:.0f} MB"
+        else:
+            status = f"{proc.name} encerrado"
+        self.blit_centered(self.fonts["text"].render(status, True, COLORS["disabled"]),
+                           (self.width // 2, self.height // 2))
+        self.blit_centered(self.text("Voltar ao Menu (○)", "text", COLORS["text"]),
+                           (self.width // 2, int(self.height * 0.9)))
+
+    def play_game(self, game):
+        try:
+            self.game_process = self.supervisor.launch([catalog.install_path(game)], name=game["title"],
+                                                       game_id=game["id"])
+        except Exception as e:
+            self.show_message(f"Não foi possível iniciar o jogo: {e}")
+            return
+        storage.mark_played(game["id"], time.time())
+        metrics.GAME_LAUNCHES.inc(game=game["id"])
+        metrics.GAMES_RUNNING.inc()
+        self.screen_name = "in_game"
+        self.invalidate()
+        self.render()
+        self.enter_background_mode()
+
+    def on_game_ready(self, proc):
+        log.info(f"{proc.name} pronto em {proc.launch_to_ready:.2f}s")
+        metrics.GAME_READY.observe(proc.launch_to_ready)
+        self.call_soon(self.invalidate, self.status_rect())
+
+    def on_game_exit(self, proc):
+        if proc.crashed:
+            result = "crashed"
+        elif proc.killed:
+            result = "killed"
+        elif proc.stop_requested:
+            result = "stopped"
+        else:
+            result = "ok"
+        metrics.GAME_EXITS.inc(game=proc.game_id, result=result)
+        metrics.GAMES_RUNNING.dec()
+        self.call_soon(self.handle_game_exit, proc)
+
+    def handle_game_exit(self, proc):
+        if proc is not self.game_process:
+            return
+        self.game_process = None
+        self.exit_background_mode()
+        self.open_games()
+        if proc.crashed:
+            self.show_message(f"{proc.name} encerrou inesperadamente (código {proc.exit_code}).")
+
+    def enter_background_mode(self):
+        """Libera CPU, memória e a tela para o jogo enquanto ele estiver rodando"""
+        if self.suspended:
+            return
+        self.suspended = True
+        if self.prefetcher is not None:
+            self.prefetcher.cancel()
+        self.dwell_deadline = None
+        self.sounds.clear()
+        pygame.mixer.quit()
+        self.images.clear()
+        self.card_surfaces.clear()
+        self.text_cache.clear()
+        gc.collect()
+        pygame.display.iconify()
+        self.priority_state = process_priority.lower_priority()
+
+    def exit_background_mode(self):
+        if not self.suspended:
+            return
+        self.suspended = False
+        process_priority.restore_priority(self.priority_state)
+        self.priority_state = None
+        # Recria a tela (a janela foi minimizada para o jogo)
+        self.setup_display()
+        self.load_sounds()
+        self.invalidate()
+
+    # Download
+
+    def start_download(self, game):
+        if self.download is not None:
+            return
+        self.download = {"game": game, "progress": 0.0, "text": "Preparando download...", "cancelled": False}
+        self.screen_name = "download"
+        self.invalidate()
+        threading.Thread(target=self.execute_download, args=(self.download,), daemon=True).start()
+
+    def execute_download(self, state):
+        def progress_callback(progress, downloaded, total, speed):
+            self.call_soon(self.update_download, state, progress,
+                           f"{downloaded / (1024 * 1024):.1f}MB de {total / (1024 * 1024):.1f}MB | {speed:.2f} MB/s")
+
+        game = state["game"]
+        try:
+            installer.install_game(game, progress_callback, is_cancelled=lambda: state["cancelled"])
+            self.call_soon(self.finish_download, state, f"{game['title']} instalado com sucesso!")
+        except installer.DownloadCancelled:
+            log.info(f"Download de {game['title']} cancelado")
+            self.call_soon(self.finish_download, state, None)
+        except Exception as e:
+            log.error(f"Falha no download: {e}")
+            self.call_soon(self.finish_download, state, f"Falha no download: {e}")
+
+    def update_download(self, state, progress, text):
+        if state is self.download:
+            state["progress"] = progress
+            state["text"] = text
+            self.invalidate(self.download_rect())
+
+    def finish_download(self, state, message):
+        if state is not self.download:
+            return
+        self.download = None
+        for game in self.games:
+            game["installed"] = os.path.exists(catalog.install_path(game))
+        self.screen_name = "games"
+        self.invalidate()
+        if message:
+            self.show_message(message)
+
+    def download_rect(self):
+        return pygame.Rect(self.width // 2 - 300, self.height // 2 - 100, 600, 200)
+
+    def draw_download(self):
+        state = self.download
+        if state is None:
+            return
+        area = self.download_rect()
+        pygame.draw.rect(self.screen, COLORS["card"], area)
+        self.blit_centered(self.text(f"Baixando {state['game']['title']}", "card_title", COLORS["text"]),
+                           (area.centerx, area.top + 35))
+        bar = pygame.Rect(area.left + 50, area.top + 75, area.width - 100, 24)
+        pygame.draw.rect(self.screen, COLORS["bg"], bar)
+        filled = bar.copy()
+        filled.width = int(bar.width * min(state["progress"], 100) / 100)
+        pygame.draw.rect(self.screen, COLORS["accent"], filled)
+        self.blit_centered(self.fonts["small"].render(state["text"], True, COLORS["disabled"]),
+                           (area.centerx, area.top + 125))
+        self.blit_centered(self.text("○ Cancelar", "small", COLORS["text"]), (area.centerx, area.bottom - 30))
+
+    # Mensagens
+
+    def message_rect(self):
+        return pygame.Rect(0, self.height - 90, self.width, 50)
+
+    def show_message(self, text, seconds=4):
+        self.message = text
+        self.message_until = time.monotonic() + seconds
+        self.invalidate(self.message_rect())
+
+    def draw_message(self):
+        area = self.message_rect()
+        pygame.draw.rect(self.screen, COLORS["header"], area)
+        self.blit_centered(self.fonts["text"].render(self.message, True, COLORS["text"]), area.center)
+
+    # Entrada
+
+    def call_soon(self, func, *args):
+        """Agenda uma chamada no loop principal (seguro a partir de outras threads)"""
+        self.calls.put((func, args))
+
+    def dispatch_input(self, source, action):
+        handlers = {
+            "up": lambda: self.move_selection(-1),
+            "down": lambda: self.move_selection(1),
+            "confirm": self.select_item,
+            "back": self.back_action
+        }
+        if self.trace_recorder:
+            self.trace_recorder.record(source, action, self.screen_name)
+        start = time.perf_counter()
+        handlers[action]()
+        metrics.INPUT_HANDLING.observe(time.perf_counter() - start)
+        metrics.INPUT_EVENTS.inc(source=source, action=action)
+
+    def move_selection(self, direction):
+        if self.screen_name == "main_menu":
+            new_index = (self.selected_index + direction) % len(MENU_OPTIONS)
+            if new_index != self.selected_index:
+                self.invalidate(self.menu_row_rect(self.selected_index))
+                self.selected_index = new_index
+                self.invalidate(self.menu_row_rect(self.selected_index))
+                self.play_sound("navigate")
+
+        elif self.screen_name == "games" and self.games:
+            new_index = max(0, min(len(self.games) - 1, self.selected_card_index + direction))
+            if new_index != self.selected_card_index:
+                previous = self.selected_card_index
+                self.selected_card_index = new_index
+                if self.ensure_selected_visible():
+                    self.invalidate(self.list_viewport())
+                else:
+                    self.invalidate(self.card_rect(previous).inflate(6, 6))
+                    self.invalidate(self.card_rect(new_index).inflate(6, 6))
+                self.play_sound("navigate")
+                self.schedule_prefetch()
+
+    def select_item(self):
+        self.play_sound("confirm")
+        if self.screen_name == "main_menu":
+            option = MENU_OPTIONS[self.selected_index]
+            if option == "Jogos":
+                self.open_games()
+            elif option == "Sair":
+                self.running = False
+        elif self.screen_name == "games" and self.games:
+            game = self.games[self.selected_card_index]
+            if game["installed"]:
+                self.play_game(game)
+            elif self.availability.get(game["id"], True):
+                self.start_download(game)
+
+    def back_action(self):
+        self.play_sound("back")
+        if self.screen_name == "in_game":
+            if self.game_process:
+                self.supervisor.terminate(self.game_process)
+                self.game_process = None
+            self.exit_background_mode()
+            self.screen_name = "main_menu"
+            self.invalidate()
+        elif self.screen_name == "download":
+            self.download["cancelled"] = True
+        elif self.screen_name == "games":
+            self.screen_name = "main_menu"
+            self.invalidate()
+        elif self.screen_name == "main_menu":
+            self.running = False
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.running = False
+        elif event.type == pygame.JOYDEVICEADDED and self.joystick is None:
+            self.setup_joystick()
+        elif event.type == pygame.JOYDEVICEREMOVED:
+            self.joystick = None
+            log.warning("Controle desconectado")
+        elif self.suspended:
+            # Durante o jogo só o botão de voltar é tratado
+            if event.type == pygame.JOYBUTTONDOWN and event.button == BUTTON_MAP['circle']:
+                self.dispatch_input("joystick", "back")
+        elif event.type == pygame.KEYDOWN and event.key in KEY_ACTIONS:
+            self.dispatch_input("keyboard", KEY_ACTIONS[event.key])
+        elif event.type == pygame.JOYHATMOTION:
+            if event.value[1] == 1:
+                self.dispatch_input("joystick", "up")
+            elif event.value[1] == -1:
+                self.dispatch_input("joystick", "down")
+        elif event.type == pygame.JOYBUTTONDOWN:
+            if event.button == BUTTON_MAP['x']:
+                self.dispatch_input("joystick", "confirm")
+            elif event.button == BUTTON_MAP['circle']:
+                self.dispatch_input("joystick", "back")
+
+    # Loop principal
+
+    def step(self):
+        """Um quadro: eventos, chamadas pendentes, temporizadores e redesenho"""
+        for event in pygame.event.get():
+            self.handle_event(event)
+        while True:
+            try:
+                func, args = self.calls.get_nowait()
+            except queue.Empty:
+                break
+            func(*args)
+        if self.message and time.monotonic() > self.message_until:
+            self.message = None
+            self.invalidate(self.message_rect())
+        self.check_prefetch()
+        self.check_game_status()
+        self.check_memory()
+        self.render()
+
+    def run(self):
+        self.play_sound("startup")
+        clock = pygame.time.Clock()
+        fps = self.config["pygame_fps"]
+        try:
+            while self.running:
+                start = time.perf_counter()
+                self.step()
+                metrics.FRAME_TIME.observe(time.perf_counter() - start)
+                # Em segundo plano o loop cai para 4 Hz
+                clock.tick(4 if self.suspended else fps)
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        self.running = False
+        if self.trace_recorder:
+            self.trace_recorder.close()
+        if self.prefetcher is not None:
+            self.prefetcher.stop()
+        self.metadata.shutdown()
+        self.supervisor.shutdown()
+        if self.metrics_exporter:
+            self.metrics_exporter.stop()
+        if self.peer_cache_server:
+            self.peer_cache_server.stop()
+        pygame.quit()
@@ -0,0 +1,131 @@
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RANGE_PATTERN = re.compile(r"bytes=(\d*)-(\d*)$")
+COPY_CHUNK = 256 * 1024
+
+
+class RangeRequestHandler(BaseHTTPRequestHandler):
+    """Serve arquivos por HTTP com suporte a HEAD e a um único intervalo (Range)
+
+    Subclasses definem `resolve_path` para mapear a URL a um arquivo local e
+    podem sobrescrever `write_chunk` para controlar como os bytes são enviados.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def resolve_path(self, url_path):
+        raise NotImplementedError
+
+    def log_message(self, format, *args):
+        # Sem log por requisição no stderr
+        pass
+
+    def do_HEAD(self):
+        self.serve(send_body=False)
+
+    def do_GET(self):
+        self.serve(send_body=True)
+
+    def parse_range(self, size):
+        """Devolve (início, fim) inclusivos, None sem Range, ou False se inválido"""
+        header = self.headers.get("Range")
+        if not header:
+            return None
+        match = RANGE_PATTERN.match(header.strip())
+        if not match or match.group(1) == match.group(2) == "":
+            return False
+        first, last = match.groups()
+        if first == "":
+            # Sufixo: bytes=-N (últimos N bytes)
+            start = max(0, size - int(last))
+            end = size - 1
+        else:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        if start >= size or start > end:
+            return False
+        return start, end
+
+    def serve(self, send_body):
+        path = self.resolve_path(self.path.split("?", 1)[0])
+        if path is None or not os.path.isfile(path):
+            self.send_error(404)
+            return
+
+        size = os.path.getsize(path)
+        byte_range = self.parse_range(size)
+        if byte_range is False:
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if byte_range is None:
+            start, end = 0, size - 1
+            self.send_response(200)
+        else:
+            start, end = byte_range
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+
+        length = end - start + 1 if size > 0 else 0
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(length))
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+
+        if not send_body or length == 0:
+            return
+        try:
+            with open(path, "rb") as f:
+                f.seek(start)
+                remaining = length
+                while remaining > 0:
+                    chunk = f.read(min(COPY_CHUNK, remaining))
+                    if not chunk:
+                        break
+                    self.write_chunk(chunk)
+                    remaining -= len(chunk)
+        except (BrokenPipeError, ConnectionResetError):
+            # Cliente desistiu (ex.: troca de espelho no meio do download)
+            pass
+
+    def write_chunk(self, chunk):
+        self.wfile.write(chunk)
+
+
+class BackgroundServer:
+    """Executa um ThreadingHTTPServer em uma thread daemon"""
+
+    def __init__(self, handler_class, host="127.0.0.1", port=0):
+        self.httpd = ThreadingHTTPServer((host, port), handler_class)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def port(self):
+        return self.httpd.server_address[1]
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -3,7 +3,10 @@ from setuptools import setup
 setup(
     name='toolstaff',
     version='1.0',
-    py_modules=['toolstaff'],
+    py_modules=['toolstaff', 'launcher_log', 'launcher_config', 'catalog', 'health_check',
+                'installer', 'install_records', 'verify', 'metrics',
+                'range_server', 'peer_cache', 'mirrors',
+                'archives', 'storage', 'memory_budget'],
     entry_points={
         'console_scripts': [
             'toolstaff=toolstaff:main',
@@ -0,0 +1,146 @@
+import os
+import sys
+import json
+import logging
+import threading
+import time
+import traceback
+from collections import Counter
+
+log = logging.getLogger(__name__)
+
+
+class StallWatchdog:
+    """Detecta travamentos do mainloop do Tk usando um heartbeat via after()"""
+
+    def __init__(self, root, threshold_ms=250, interval_ms=50,
+                 report_path=os.path.join("logs", "stalls.jsonl"),
+                 max_samples=20, context=None, on_stall=None):
+        self.root = root
+        self.threshold = threshold_ms / 1000.0
+        self.interval_ms = interval_ms
+        self.report_path = report_path
+        self.max_samples = max_samples
+        self.context = context
+        self.on_stall = on_stall
+
+        # O watchdog precisa ser criado na thread do Tk
+        self.main_thread_id = threading.get_ident()
+        self.lock = threading.Lock()
+        self.running = False
+        self.last_beat = None
+        self.current_stall = None
+        self.after_id = None
+        self.monitor_thread = None
+        self.stall_count = 0
+
+    def start(self):
+        """Inicia o heartbeat e a thread de monitoramento"""
+        if self.running:
+            return
+        # Um monitor anterior ainda acordado veria running=True e dividiria o estado
+        if self.monitor_thread is not None:
+            self.monitor_thread.join()
+        self.running = True
+        self.after_id = self.root.after_idle(self._beat)
+        self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
+        self.monitor_thread.start()
+
+    def stop(self):
+        """Para o watchdog"""
+        self.running = False
+        if self.after_id is not None:
+            try:
+                self.root.after_cancel(self.after_id)
+            except Exception:
+                pass
+            self.after_id = None
+        # Sem isso o próximo start() contaria todo o tempo parado como travamento
+        with self.lock:
+            self.last_beat = None
+            self.current_stall = None
+
+    def _beat(self):
+        """Heartbeat executado pelo mainloop do Tk"""
+        if not self.running:
+            return
+
+        now = time.monotonic()
+        with self.lock:
+            stall = self.current_stall
+            last_beat = self.last_beat
+            self.current_stall = None
+            self.last_beat = now
+
+        if stall is not None:
+            # O atraso real é o tempo além do intervalo agendado
+            stall["duration_ms"] = round((now - last_beat) * 1000 - self.interval_ms, 1)
+            self._write_report(stall)
+
+        self.after_id = self.root.after(self.interval_ms, self._beat)
+
+    def _monitor_loop(self):
+        """Verifica se o heartbeat está atrasado e coleta amostras da pilha"""
+        sleep_time = self.interval_ms / 2000.0
+        while self.running:
+            time.sleep(sleep_time)
+
+            with self.lock:
+                if self.last_beat is None:
+                    continue
+                late = time.monotonic() - self.last_beat - self.interval_ms / 1000.0
+                if late < self.threshold:
+                    continue
+
+                if self.current_stall is None:
+                    self.current_stall = {
+                        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+                        "threshold_ms": round(self.threshold * 1000),
+                        "context": self._get_context(),
+                        "samples": []
+                    }
+
+                samples = self.current_stall["samples"]
+                if len(samples) < self.max_samples:
+                    stack = self._sample_main_thread()
+                    if stack:
+                        samples.append(stack)
+
+    def _sample_main_thread(self):
+        """Captura a pilha atual da thread principal"""
+        frame = sys._current_frames().get(self.main_thread_id)
+        if frame is None:
+            return None
+        return "".join(traceback.format_stack(frame))
+
+    def _get_context(self):
+        if self.context is None:
+            return None
+        try:
+            return self.context()
+        except Exception:
+            return None
+
+    def _write_report(self, stall):
+        """Grava o travamento no arquivo de relatório (uma linha JSON por evento)"""
+        samples = stall.pop("samples")
+        stacks = Counter(samples)
+        stall["sample_count"] = len(samples)
+        stall["stacks"] = [
+            {"count": count, "stack": stack}
+            for stack, count in stacks.most_common()
+        ]
+        self.stall_count += 1
+
+        try:
+            directory = os.path.dirname(self.report_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.report_path, "a", encoding="utf-8") as report:
+                report.write(json.dumps(stall, ensure_ascii=False) + "\n")
+        except Exception as e:
+            log.error(f"Erro ao gravar relatório de travamento: {e}")
+
+        log.warning(f"Travamento da interface: {stall['duration_ms']:.0f} ms ({stall['context']})")
+        if self.on_stall:
+            self.on_stall(stall)
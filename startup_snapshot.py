@@ -0,0 +1,103 @@
+import os
+import json
+import struct
+
+# Formato: MAGIC | tamanho do cabeçalho (uint32) | cabeçalho JSON | blobs das imagens
+SNAPSHOT_VERSION = 1
+MAGIC = b"TSSNAP\x00\x01"
+HEADER_SIZE = struct.Struct("<I")
+SNAPSHOT_PATH = os.path.join("cache", "startup.snapshot")
+
+
+def file_signature(path):
+    """Assinatura barata de um arquivo: (mtime_ns, tamanho) ou None se não existir"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def save_snapshot(catalog, catalog_sources, images, path=SNAPSHOT_PATH):
+    """Grava catálogo, estado de instalação e imagens já redimensionadas em um único arquivo"""
+    entries = []
+    blobs = []
+    offset = 0
+    for (source, width, height), image in images.items():
+        data = image.tobytes()
+        entries.append({
+            "source": source,
+            "signature": file_signature(source),
+            "mode": image.mode,
+            "size": [width, height],
+            "offset": offset,
+            "length": len(data)
+        })
+        blobs.append(data)
+        offset += len(data)
+
+    header = json.dumps({
+        "version": SNAPSHOT_VERSION,
+        "catalog": catalog,
+        "catalog_sources": {source: file_signature(source) for source in catalog_sources},
+        "images": entries
+    }, ensure_ascii=False).encode("utf-8")
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # Grava em arquivo temporário e renomeia para nunca deixar um snapshot pela metade
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(HEADER_SIZE.pack(len(header)))
+        f.write(header)
+        for data in blobs:
+            f.write(data)
+    os.replace(temp_path, path)
+
+
+def load_snapshot(catalog_sources, path=SNAPSHOT_PATH):
+    """Lê o snapshot com uma única leitura e descarta o que estiver desatualizado
+
+    Devolve (catalog, images): catalog é None se alguma fonte mudou e images
+    contém apenas as imagens cujo arquivo de origem não foi alterado.
+    """
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except OSError:
+        return None, {}
+
+    prefix = len(MAGIC) + HEADER_SIZE.size
+    if len(raw) < prefix or raw[:len(MAGIC)] != MAGIC:
+        return None, {}
+
+    (header_size,) = HEADER_SIZE.unpack_from(raw, len(MAGIC))
+    try:
+        header = json.loads(raw[prefix:prefix + header_size].decode("utf-8"))
+    except ValueError:
+        return None, {}
+    if header.get("version") != SNAPSHOT_VERSION:
+        return None, {}
+
+    catalog = header["catalog"]
+    saved_sources = header["catalog_sources"]
+    if set(saved_sources) != set(catalog_sources) or any(
+            file_signature(source) != signature for source, signature in saved_sources.items()):
+        catalog = None
+
+    from PIL import Image
+    images = {}
+    blob_start = prefix + header_size
+    view = memoryview(raw)
+    for entry in header["images"]:
+        if entry["signature"] is None or file_signature(entry["source"]) != entry["signature"]:
+            continue
+        start = blob_start + entry["offset"]
+        data = view[start:start + entry["length"]]
+        width, height = entry["size"]
+        images[(entry["source"], width, height)] = Image.frombytes(entry["mode"], (width, height), bytes(data))
+
+    return catalog, images
@@ -0,0 +1,132 @@
+import os
+import shutil
+import logging
+import threading
+
+import catalog
+import install_records
+
+log = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+_lock = threading.Lock()
+# Espaço reservado pelos downloads em andamento: {id do jogo: bytes}
+_reserved = {}
+
+
+class InsufficientSpace(Exception):
+    pass
+
+
+def installed_bytes(record):
+    """Espaço ocupado por uma instalação, pelos arquivos listados no registro"""
+    total = 0
+    for relpath in (record or {}).get("files", {}):
+        try:
+            total += os.path.getsize(os.path.join(catalog.INSTALL_DIR, relpath))
+        except OSError:
+            pass
+    return total
+
+
+def last_used(record):
+    """Momento do último uso: a última vez que foi jogado ou, se nunca foi, a instalação"""
+    return record.get("last_played") or record.get("installed_at") or 0
+
+
+def free_bytes():
+    path = catalog.INSTALL_DIR if os.path.isdir(catalog.INSTALL_DIR) else "."
+    return shutil.disk_usage(path).free
+
+
+def eviction_candidates(records, protected=()):
+    """Jogos instalados que podem ser removidos, do menos para o mais recentemente jogado"""
+    candidates = [game_id for game_id, record in records.items()
+                  if game_id not in protected and record.get("files")]
+    return sorted(candidates, key=lambda game_id: last_used(records[game_id]))
+
+
+def remove_install(game_id, record):
+    """Apaga os arquivos de uma instalação e o seu registro"""
+    game = catalog.find_game(catalog.GAMES, game_id)
+    if game is not None and record.get("archive"):
+        shutil.rmtree(catalog.install_dir(game), ignore_errors=True)
+    for relpath in record.get("files", {}):
+        try:
+            os.remove(os.path.join(catalog.INSTALL_DIR, relpath))
+        except FileNotFoundError:
+            pass
+    install_records.remove_record(game_id)
+
+
+def ensure_space(game_id, needed, quota_mb=0, min_free_mb=0, evict=True, protected=()):
+    """Garante `needed` bytes para instalar `game_id`, removendo jogos antigos se preciso
+
+    Respeita a cota total das instalações (`quota_mb`, 0 = sem cota) e
+    mantém `min_free_mb` livres no disco, descontando o que outros downloads
+    já reservaram. Deve ser chamada com `_lock`.
+    """
+    records = install_records.load_records()
+    protected = set(protected) | {game_id} | set(_reserved)
+    quota = quota_mb * MB
+    # A instalação atual será substituída, então não conta na cota
+    usage = sum(installed_bytes(record) for other, record in records.items() if other != game_id)
+    reserved = sum(size for other, size in _reserved.items() if other != game_id)
+
+    def shortfall():
+        missing = needed + reserved + min_free_mb * MB - free_bytes()
+        if quota:
+            missing = max(missing, usage + reserved + needed - quota)
+        return missing
+
+    candidates = eviction_candidates(records, protected) if evict else []
+    if shortfall() > sum(installed_bytes(records[victim]) for victim in candidates):
+        # Nem removendo tudo haveria espaço: não apaga nada à toa
+        candidates = []
+    while shortfall() > 0 and candidates:
+        victim = candidates.pop(0)
+        size = installed_bytes(records[victim])
+        log.warning(f"Removendo {victim} ({size / MB:.1f} MB, uso menos recente) para liberar espaço")
+        remove_install(victim, records[victim])
+        usage -= size
+
+    missing = shortfall()
+    if missing > 0:
+        raise InsufficientSpace(
+            f"Espaço insuficiente: faltam {missing / MB:.1f} MB para instalar ({needed / MB:.1f} MB)")
+
+
+class Reservation:
+    """Reserva de espaço para o download de um jogo; use como context manager
+
+    `require` é chamada com o tamanho do download assim que o servidor o
+    informa, antes de gravar qualquer byte.
+    """
+
+    def __init__(self, game, config):
+        self.game = game
+        self.config = config
+
+    def require(self, content_length):
+        # Jogos compactados ocupam mais depois de extraídos
+        needed = max(content_length, self.game.get("installed_size", 0))
+        with _lock:
+            ensure_space(self.game["id"], needed,
+                         quota_mb=self.config["install_quota_mb"],
+                         min_free_mb=self.config["install_min_free_mb"],
+                         evict=self.config["install_evict_lru"])
+            _reserved[self.game["id"]] = needed
+        log.info(f"{needed / MB:.1f} MB reservados para {self.game['title']}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        with _lock:
+            _reserved.pop(self.game["id"], None)
+
+
+def mark_played(game_id, when):
+    """Registra o último uso de um jogo (ordem de remoção por LRU)"""
+    install_records.update_record(game_id, last_played=when)
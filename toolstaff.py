@@ -1,4 +1,198 @@
-def main():
+import re
+import sys
+import json
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from launcher_log import tail_logs, LEVELS
+import health_check
+import archives
+import catalog
+import installer
+import verify
+import install_records
+import peer_cache
+import memory_budget
+from launcher_config import load_config
+
+_output_lock = threading.Lock()
+
+
+def emit(event, **fields):
+    """Imprime um evento de progresso em JSON (uma linha por evento)"""
+    with _output_lock:
+        print(json.dumps({"event": event, **fields}, ensure_ascii=False), flush=True)
+
+
+def show_logs(count=50, grep=None, level=None, path=None):
+    try:
+        lines = tail_logs(count=count, grep=grep, level=level, path=path)
+    except OSError as e:
+        print(f"Erro ao ler logs: {e}")
+        return 1
+    if not lines:
+        print("Nenhuma linha de log encontrada.")
+    for line in lines:
+        print(line)
+    return 0
+
+
+def show_status(as_json=False, budget=None):
+    report = health_check.run_checks(budget=budget)
+    if as_json:
+        print(health_check.format_json(report))
+    else:
+        print(health_check.format_report(report))
+    return 2 if report["status"] in (health_check.FAIL, health_check.TIMEOUT) else 0
+
+
+def install_one(game, interval=0.5):
+    last_emit = [0.0]
+
+    def progress_callback(progress, downloaded, total, speed):
+        now = time.monotonic()
+        if now - last_emit[0] >= interval or downloaded == total:
+            last_emit[0] = now
+            emit("progress", id=game["id"], percent=round(progress, 1),
+                 downloaded=downloaded, total=total, speed_mbps=round(speed, 2))
+
+    emit("start", id=game["id"], version=game["version"], url=catalog.download_url(game))
+    try:
+        record = installer.install_game(game, progress_callback)
+    except Exception as e:
+        emit("error", id=game["id"], error=str(e))
+        return False
+    emit("done", id=game["id"], version=record["version"], size=record["size"], md5=record["md5"])
+    return True
+
+
+def run_installs(games, jobs):
+    """Instala os jogos em paralelo, sem interface gráfica"""
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        results = list(pool.map(install_one, games))
+    failed = [game["id"] for game, ok in zip(games, results) if not ok]
+    emit("summary",
+         installed=[game["id"] for game, ok in zip(games, results) if ok],
+         failed=failed,
+         duration=round(time.monotonic() - start, 2))
+    return 1 if failed else 0
+
+
+def install(game_ids, install_all=False, jobs=1, force=False):
+    games = catalog.load_catalog()
+    if install_all:
+        selected = games
+    else:
+        selected = []
+        # Ids repetidos baixariam o mesmo jogo duas vezes para o mesmo .part
+        for game_id in dict.fromkeys(game_ids):
+            game = catalog.find_game(games, game_id)
+            if game is None:
+                emit("error", id=game_id, error="jogo não encontrado no catálogo")
+                return 2
+            selected.append(game)
+
+    if not force:
+        selected = [game for game in selected if not game["installed"]]
+    return run_installs(selected, jobs)
+
+
+def update(jobs=1):
+    return run_installs(installer.outdated_games(catalog.load_catalog()), jobs)
+
+
+def run_verify(jobs=None, full=False, as_json=False):
+    report = verify.verify_installs(jobs=jobs, full=full)
+    if as_json:
+        print(json.dumps(report, ensure_ascii=False))
+    else:
+        for game_id, result in report["games"].items():
+            print(f"{game_id}: {result['status']}")
+            for relpath, state in result["files"].items():
+                print(f"  {state:8} {relpath}")
+        for relpath in report["untracked"]:
+            print(f"  (não registrado) {relpath}")
+        print(f"{report['hashed_files']} arquivo(s) verificados, {report['hashed_mb']} MB "
+              f"em {report['duration']}s")
+    return 0 if report["status"] == "ok" else 1
+
+
+def pin_hashes(write=False):
+    """Fixa no catálogo o MD5 dos jogos instalados e verificados (habilita o cache entre peers)"""
+    verify.verify_installs()
+    records = install_records.load_records()
+    hashes = catalog.load_hashes()
+    pinned = 0
+    for game in catalog.GAMES:
+        if game.get("md5") or archives.archive_format(game):
+            continue
+        record = records.get(game["id"])
+        if not record or record.get("version") != game["version"] or record.get("verify_status") != "ok":
+            print(f"{game['id']}: não instalado ou não verificado na versão {game['version']}")
+            continue
+        md5 = record.get("files", {}).get(game["file"], {}).get("md5")
+        if not md5:
+            continue
+        print(f"{game['id']} {game['version']} {md5}")
+        hashes.setdefault(game["id"], {})[game["version"]] = md5
+        pinned += 1
+    if write and pinned:
+        catalog.save_hashes(hashes)
+        print(f"{pinned} hash(es) gravados em {catalog.HASHES_PATH}; copie o arquivo para os outros launchers")
+    elif pinned:
+        print("Use --write para gravar.")
+    return 0
+
+
+def serve(host=None, port=None):
+    """Serve os jogos verificados para outros launchers da rede local"""
+    config = load_config()
+    host = host or config["peer_cache_host"]
+    port = config["peer_cache_port"] if port is None else port
+    try:
+        server = peer_cache.PeerCacheServer(host, port).start()
+    except OSError as e:
+        print(f"Erro ao abrir a porta {port}: {e}")
+        return 1
+
+    print(f"Servindo jogos verificados em {server.base_url} (Ctrl+C para sair)")
+    artifacts = peer_cache.available_artifacts()
+    if not artifacts:
+        print("Nenhum jogo verificado para servir; rode 'toolstaff verify' e 'toolstaff hashes --write' primeiro.")
+    for artifact in artifacts:
+        print(f"  {artifact['path']} ({artifact['size'] / (1024 * 1024):.1f} MB, MD5 {artifact['md5']})")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+def show_memory(as_json=False, path=None):
+    """Mostra o último relatório de memória gravado pelo launcher"""
+    path = path or load_config()["memory_report_path"]
+    try:
+        report = memory_budget.load_report(path)
+    except FileNotFoundError:
+        print(f"Nenhum relatório de memória em {path}; o launcher está rodando?")
+        return 1
+    except (OSError, ValueError) as e:
+        print(f"Erro ao ler relatório de memória: {e}")
+        return 1
+    if as_json:
+        print(json.dumps(report, ensure_ascii=False))
+    else:
+        print(memory_budget.format_report(report))
+    return 0
+
+
+def interactive_menu():
     print("=== Ferramenta da STAFF ===")
     print("1. Ver Logs")
     print("2. Checar status")
@@ -6,13 +200,92 @@ def main():
 
     opcao = input("Escolha uma opção: ")
     if opcao == "1":
-        print("Exibindo logs...")
+        return show_logs()
     elif opcao == "2":
-        print("Tudo funcionando normalmente.")
+        return show_status()
     elif opcao == "3":
         print("Saindo...")
     else:
         print("Opção inválida.")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="toolstaff", description="Ferramenta da STAFF")
+    commands = parser.add_subparsers(dest="command")
+
+    logs = commands.add_parser("logs", help="mostra as últimas linhas do log do launcher")
+    logs.add_argument("-n", "--lines", type=int, default=50, help="quantidade de linhas (padrão: 50)")
+    logs.add_argument("-g", "--grep", help="filtra por expressão regular (sem diferenciar maiúsculas)")
+    logs.add_argument("-l", "--level", choices=LEVELS, type=str.upper, help="nível mínimo")
+    logs.add_argument("-f", "--file", help="arquivo de log (padrão: o configurado no launcher)")
+
+    status = commands.add_parser("status", help="verifica instalação, assets, disco, áudio, controle e rede")
+    status.add_argument("--json", action="store_true", help="saída em JSON")
+    status.add_argument("--budget", type=float, help="tempo máximo em segundos (padrão: configuração)")
+
+    install_cmd = commands.add_parser("install", help="instala jogos do catálogo sem abrir a interface")
+    install_cmd.add_argument("ids", nargs="*", help="ids dos jogos (veja o catálogo)")
+    install_cmd.add_argument("--all", action="store_true", help="instala todo o catálogo")
+    install_cmd.add_argument("-j", "--jobs", type=int, default=2, help="downloads simultâneos (padrão: 2)")
+    install_cmd.add_argument("--force", action="store_true", help="reinstala jogos já instalados")
+
+    update_cmd = commands.add_parser("update", help="reinstala jogos cuja versão difere do catálogo")
+    update_cmd.add_argument("-j", "--jobs", type=int, default=2, help="downloads simultâneos (padrão: 2)")
+
+    verify_cmd = commands.add_parser("verify", help="verifica a integridade dos jogos instalados")
+    verify_cmd.add_argument("-j", "--jobs", type=int, help="processos para calcular hashes (padrão: CPUs)")
+    verify_cmd.add_argument("--full", action="store_true", help="recalcula mesmo arquivos inalterados")
+    verify_cmd.add_argument("--json", action="store_true", help="saída em JSON")
+
+    hashes_cmd = commands.add_parser("hashes", help="fixa o MD5 dos jogos verificados no catálogo local")
+    hashes_cmd.add_argument("--write", action="store_true", help=f"grava em {catalog.HASHES_PATH}")
+
+    serve_cmd = commands.add_parser("serve", help="serve os jogos verificados para outros launchers da rede")
+    serve_cmd.add_argument("--host", help="endereço de escuta (padrão: configuração)")
+    serve_cmd.add_argument("--port", type=int, help="porta (padrão: configuração)")
+
+    memory_cmd = commands.add_parser("memory", help="mostra a memória usada por cada parte do launcher")
+    memory_cmd.add_argument("--json", action="store_true", help="saída em JSON")
+    memory_cmd.add_argument("-f", "--file", help="relatório (padrão: o configurado no launcher)")
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        return interactive_menu()
+    if args.command == "logs":
+        if args.lines < 0:
+            parser.error("-n/--lines não pode ser negativo")
+        if args.grep:
+            try:
+                re.compile(args.grep)
+            except re.error as e:
+                parser.error(f"expressão regular inválida em --grep: {e}")
+        if args.lines == 0:
+            return 0
+        return show_logs(args.lines, args.grep, args.level, args.file)
+    if args.command == "status":
+        return show_status(args.json, args.budget)
+    if args.command == "install":
+        if not args.all and not args.ids:
+            parser.error("informe os ids dos jogos ou --all")
+        return install(args.ids, args.all, args.jobs, args.force)
+    if args.command == "update":
+        return update(args.jobs)
+    if args.command == "verify":
+        return run_verify(args.jobs, args.full, args.json)
+    if args.command == "hashes":
+        return pin_hashes(args.write)
+    if args.command == "serve":
+        return serve(args.host, args.port)
+    if args.command == "memory":
+        return show_memory(args.json, args.file)
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
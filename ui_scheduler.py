@@ -0,0 +1,148 @@
+import time
+import logging
+import threading
+import tkinter as tk
+from collections import deque
+
+log = logging.getLogger(__name__)
+
+# Prioridades, da mais urgente para a menos urgente
+INPUT = 0
+UPDATE = 1
+BULK = 2
+
+
+class Task:
+    __slots__ = ("func", "args", "key", "steps", "priority")
+
+    def __init__(self, func, args, key=None, steps=None, priority=UPDATE):
+        self.func = func
+        self.args = args
+        self.key = key
+        self.steps = steps
+        self.priority = priority
+
+
+class UIScheduler:
+    """Executa o trabalho da interface em pequenas unidades na thread do Tk
+
+    Qualquer thread pode chamar `post`; as tarefas rodam em `after_idle`,
+    entrada primeiro, depois atualizações e por último o trabalho em lote,
+    até gastar `frame_budget` segundos. O que sobrar continua no próximo
+    ciclo ocioso, depois que o Tk processar os eventos pendentes.
+
+    Tarefas com a mesma `key` são agrupadas: enquanto uma estiver na fila,
+    um novo `post` só troca os argumentos dela. Trabalho longo é passado a
+    `run_steps` como um iterador, e cada passo é uma unidade.
+    """
+
+    def __init__(self, root, frame_budget=0.008):
+        self.root = root
+        self.frame_budget = frame_budget
+        self.queues = (deque(), deque(), deque())
+        self.keyed = {}
+        self.lock = threading.Lock()
+        self.scheduled = False
+        self.main_thread = threading.current_thread()
+
+    def post(self, func, *args, priority=UPDATE, key=None):
+        """Agenda func(*args) na thread do Tk; com `key`, substitui a pendente"""
+        with self.lock:
+            task = self.keyed.get(key) if key is not None else None
+            if task is not None:
+                task.func, task.args = func, args
+                return
+            task = Task(func, args, key, priority=priority)
+            if key is not None:
+                self.keyed[key] = task
+            self.queues[priority].append(task)
+        self._wake()
+
+    def run_steps(self, key, steps, priority=BULK):
+        """Consome o iterador `steps` um passo por vez; substitui outro com a mesma chave"""
+        with self.lock:
+            old = self.keyed.pop(key, None)
+            if old is not None:
+                old.func = old.steps = None
+            task = Task(None, (), key, iter(steps), priority)
+            self.keyed[key] = task
+            self.queues[priority].append(task)
+        self._wake()
+
+    def cancel(self, key):
+        with self.lock:
+            task = self.keyed.pop(key, None)
+            if task is not None:
+                task.func = task.steps = None
+
+    def pending(self):
+        with self.lock:
+            return sum(len(queue) for queue in self.queues)
+
+    def _wake(self):
+        with self.lock:
+            if self.scheduled:
+                return
+            self.scheduled = True
+        try:
+            if threading.current_thread() is self.main_thread:
+                self.root.after_idle(self._run)
+            else:
+                # after() de outra thread é repassado pelo Tcl à thread principal
+                self.root.after(0, self.root.after_idle, self._run)
+        except (RuntimeError, tk.TclError):
+            # Janela já destruída
+            with self.lock:
+                self.scheduled = False
+
+    def _next(self):
+        with self.lock:
+            for queue in self.queues:
+                while queue:
+                    task = queue.popleft()
+                    if task.func is None and task.steps is None:
+                        continue
+                    if task.steps is None and task.key is not None:
+                        self.keyed.pop(task.key, None)
+                    return task
+            self.scheduled = False
+            return None
+
+    def _run(self):
+        deadline = time.perf_counter() + self.frame_budget
+        while True:
+            task = self._next()
+            if task is None:
+                return
+            try:
+                if task.steps is not None:
+                    self._step(task)
+                else:
+                    task.func(*task.args)
+            except Exception as e:
+                log.exception(f"Erro em tarefa da interface: {e}")
+                self._forget(task)
+            if time.perf_counter() >= deadline:
+                break
+        # Devolve o controle ao Tk (eventos e redesenho) antes de continuar
+        try:
+            self.root.after_idle(self._run)
+        except tk.TclError:
+            # Uma tarefa destruiu a janela; não há mais o que agendar
+            pass
+
+    def _forget(self, task):
+        with self.lock:
+            if task.key is not None and self.keyed.get(task.key) is task:
+                del self.keyed[task.key]
+            task.func = task.steps = None
+
+    def _step(self, task):
+        try:
+            next(task.steps)
+        except StopIteration:
+            self._forget(task)
+            return
+        with self.lock:
+            if task.steps is not None:
+                self.queues[task.priority].append(task)
@@ -13,14 +13,15 @@ class GitHubGameDownloader:
     DOWNLOAD_URL = f"https://github.com/{REPO}/releases/download/{RELEASE_TAG}/{FILE_NAME}"
 
     @staticmethod
-    def download_file(destination, progress_callback=None):
-        """Faz download do arquivo do GitHub"""
+    def download_file(destination, progress_callback=None, url=None):
+        """Faz download do arquivo do GitHub (por padrão, o DOWNLOAD_URL)"""
         headers = {
             'Accept': 'application/octet-stream',
             'User-Agent': 'Game-Downloader'
         }
         
-        with requests.get(GitHubGameDownloader.DOWNLOAD_URL, headers=headers, stream=True) as response:
+        url = url or GitHubGameDownloader.DOWNLOAD_URL
+        with requests.get(url, headers=headers, stream=True) as response:
             response.raise_for_status()
             
             total_size = int(response.headers.get('content-length', 0))
@@ -8,6 +8,7 @@ import hashlib
 import subprocess
 import pygame
 from pygame.locals import *
+from ui_scheduler import UIScheduler
 
 class GameLauncher:
     def __init__(self, root):
@@ -15,6 +16,7 @@ class GameLauncher:
         self.game_cards = []  # Inicializa a lista de cards de jogo
         self.current_selection = 0
         self.downloading = False
+        self.scheduler = UIScheduler(root)
         self.setup_ui()
         self.setup_joystick()
         
@@ -78,6 +80,11 @@ class GameLauncher:
             self.canvas.yview_moveto(self.current_selection / len(self.game_cards))
     
     def setup_ui(self):
+        for _ in self.build_ui():
+            pass
+
+    def build_ui(self):
+        """Monta a interface em passos curtos; cada yield devolve o controle ao agendador"""
         self.root.title("Game Launcher")
         self.root.geometry("800x600")
         self.root.config(bg="#2c3e50")
@@ -95,6 +102,7 @@ class GameLauncher:
                 font=('Arial', 20, 'bold'),
                 bg="#34495e",
                 fg="#ecf0f1").pack(pady=10)
+        yield
         
         # Área de jogos com scrollbar
         game_container = tk.Frame(main_frame, bg="#2c3e50")
@@ -120,6 +128,7 @@ class GameLauncher:
         
         # Configura o mouse wheel para scroll
         self.canvas.bind_all("<MouseWheel>", lambda e: self.canvas.yview_scroll(int(-1*(e.delta/120)), "units"))
+        yield
         
         # Jogo disponível
         game_info = {
@@ -162,6 +171,7 @@ class GameLauncher:
                 font=('Arial', 10, 'bold'),
                 bg="#34495e",
                 fg=status_color).pack(anchor=tk.W)
+        yield
         
         # Botão de ação
         btn_frame = tk.Frame(card, bg="#34495e")
@@ -255,10 +265,11 @@ class GameLauncher:
                 if not self.downloading:
                     raise Exception("Download cancelado")
                 
-                window.after(0, lambda: self.update_progress(
-                    progress, downloaded, total, speed, 
-                    status_label, progress_bar, details_label
-                ))
+                # Agrupa as atualizações: só a mais recente é desenhada
+                self.scheduler.post(self.update_progress,
+                                    progress, downloaded, total, speed,
+                                    status_label, progress_bar, details_label,
+                                    key="progress")
             
             headers = {'User-Agent': 'GameLauncher'}
             
@@ -292,16 +303,16 @@ class GameLauncher:
             # Verificação MD5
             md5_hash = self.calculate_md5(destination)
             
-            window.after(0, lambda: self.download_complete(
-                window, game, destination, total_size
-            ))
+            self.scheduler.post(self.download_complete, window, game, destination, total_size)
             
         except Exception as e:
-            window.after(0, lambda: self.download_failed(window, str(e)))
+            self.scheduler.post(self.download_failed, window, str(e))
         finally:
             self.downloading = False
     
     def update_progress(self, progress, downloaded, total, speed, status_label, progress_bar, details_label):
+        if not status_label.winfo_exists():
+            return
         progress_bar['value'] = progress
         status_label.config(text=f"Download: {progress:.1f}% completo")
         
@@ -337,13 +348,19 @@ class GameLauncher:
             messagebox.showerror("Erro", f"Não foi possível iniciar o jogo:\n{e}")
     
     def refresh_ui(self):
-        """Atualiza a interface após instalação"""
-        for widget in self.root.winfo_children():
-            widget.destroy()
-        
+        """Atualiza a interface após instalação, em passos curtos no agendador da interface
+
+        Um novo pedido substitui a reconstrução que ainda estiver em andamento.
+        """
+        self.scheduler.run_steps("refresh", self.rebuild_ui())
+
+    def rebuild_ui(self):
         self.game_cards = []  # Reseta a lista de cards
         self.current_selection = 0
-        self.setup_ui()
+        for widget in self.root.winfo_children():
+            widget.destroy()
+            yield
+        yield from self.build_ui()
 
 if __name__ == "__main__":
     root = tk.Tk()
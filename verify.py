@@ -0,0 +1,166 @@
+import os
+import mmap
+import time
+import hashlib
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+import catalog
+import install_records
+
+log = logging.getLogger(__name__)
+
+BLOCK_SIZE = 8 * 1024 * 1024
+
+# Arquivos de controle que não fazem parte de nenhuma instalação
+IGNORED_SUFFIXES = (".part", ".tmp")
+
+
+def hash_file(path, algorithm="md5"):
+    """Calcula o hash de um arquivo via mmap, em blocos grandes"""
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return digest.hexdigest()
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                view = memoryview(data)
+                try:
+                    for offset in range(0, size, BLOCK_SIZE):
+                        digest.update(view[offset:offset + BLOCK_SIZE])
+                finally:
+                    view.release()
+        except (OSError, ValueError):
+            # Alguns sistemas de arquivos não suportam mmap
+            f.seek(0)
+            for chunk in iter(lambda: f.read(BLOCK_SIZE), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_signature(path):
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "inode": st.st_ino}
+
+
+def signature_matches(entry, signature):
+    """Se o arquivo não mudou desde que `entry` (do registro) foi verificado"""
+    return bool(entry.get("verified_at")) and all(entry.get(key) == value for key, value in signature.items())
+
+
+def game_files(game, record):
+    """Arquivos (relativos a INSTALL_DIR) que pertencem à instalação de um jogo"""
+    files = (record or {}).get("files")
+    if files:
+        return list(files)
+    return [game["file"]]
+
+
+def expected_md5(game, record, relpath):
+    """Hash esperado: o do catálogo tem prioridade sobre o registrado na instalação"""
+    if relpath == game["file"] and game.get("md5"):
+        return game["md5"]
+    member = relpath.replace(os.sep, "/").split("/", 1)
+    if member[0] == game["id"] and len(member) == 2 and member[1] in game.get("members", {}):
+        return game["members"][member[1]]
+    entry = (record or {}).get("files", {}).get(relpath, {})
+    if entry.get("md5"):
+        return entry["md5"]
+    if relpath == game["file"]:
+        return (record or {}).get("md5")
+    return None
+
+
+def untracked_files(games, records):
+    """Arquivos em INSTALL_DIR que não pertencem a nenhum jogo do catálogo"""
+    tracked = {os.path.normpath(relpath)
+               for game in games for relpath in game_files(game, records.get(game["id"]))}
+    tracked.add(os.path.basename(install_records.RECORDS_PATH))
+    untracked = []
+    for directory, _, filenames in os.walk(catalog.INSTALL_DIR):
+        for filename in filenames:
+            relpath = os.path.relpath(os.path.join(directory, filename), catalog.INSTALL_DIR)
+            if relpath not in tracked and not filename.endswith(IGNORED_SUFFIXES):
+                untracked.append(relpath)
+    return sorted(untracked)
+
+
+def verify_installs(jobs=None, full=False):
+    """Verifica as instalações em INSTALL_DIR e grava o resultado no registro
+
+    Arquivos cujo tamanho, mtime e inode são iguais aos da última verificação
+    são pulados (a menos que `full` seja verdadeiro); os demais são
+    distribuídos entre processos para calcular o hash em paralelo.
+    """
+    start = time.monotonic()
+    games = catalog.load_catalog()
+    records = install_records.load_records()
+
+    results = {}
+    to_hash = []
+    for game in games:
+        record = records.get(game["id"])
+        if record is None and not game["installed"]:
+            continue
+
+        game_result = results[game["id"]] = {"status": "ok", "files": {}}
+        for relpath in game_files(game, record):
+            path = os.path.join(catalog.INSTALL_DIR, relpath)
+            entry = (record or {}).get("files", {}).get(relpath, {})
+            try:
+                signature = file_signature(path)
+            except FileNotFoundError:
+                game_result["files"][relpath] = "missing"
+                continue
+
+            if signature_matches(entry, signature) and not full:
+                game_result["files"][relpath] = "skipped"
+            else:
+                to_hash.append((game, relpath, path, signature))
+
+    hashed_bytes = sum(signature["size"] for _, _, _, signature in to_hash)
+    paths = [path for _, _, path, _ in to_hash]
+    if len(paths) > 1 and jobs != 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            digests = list(pool.map(hash_file, paths))
+    else:
+        digests = [hash_file(path) for path in paths]
+
+    now = time.time()
+    updates = {}
+    for (game, relpath, path, signature), digest in zip(to_hash, digests):
+        expected = expected_md5(game, records.get(game["id"]), relpath)
+        if expected is None or digest == expected:
+            results[game["id"]]["files"][relpath] = "ok"
+            updates.setdefault(game["id"], {})[relpath] = dict(signature, md5=digest, verified_at=now)
+        else:
+            results[game["id"]]["files"][relpath] = "corrupt"
+            log.error(f"Arquivo corrompido: {path} (esperado {expected}, obtido {digest})")
+
+    for game_id, game_result in results.items():
+        states = set(game_result["files"].values())
+        if "corrupt" in states:
+            game_result["status"] = "corrupt"
+        elif "missing" in states:
+            game_result["status"] = "missing"
+
+    with install_records.editing_records() as records:
+        for game_id, game_result in results.items():
+            record = records.setdefault(game_id, {})
+            files = record.setdefault("files", {})
+            for relpath, entry in updates.get(game_id, {}).items():
+                files.setdefault(relpath, {}).update(entry)
+            record["verified_at"] = now
+            record["verify_status"] = game_result["status"]
+
+    duration = time.monotonic() - start
+    return {
+        "status": "ok" if all(r["status"] == "ok" for r in results.values()) else "fail",
+        "games": results,
+        "untracked": untracked_files(games, records),
+        "hashed_files": len(to_hash),
+        "hashed_mb": round(hashed_bytes / (1024 * 1024), 1),
+        "duration": round(duration, 2),
+        "mb_per_second": round(hashed_bytes / (1024 * 1024) / duration, 1) if duration > 0 else None
+    }